@@ -1,62 +1,87 @@
-def print_table(state):
-    for i in range(3):
+from sliding_puzzle import PUZZLE, blank_pos, puzzle_for
+
+def print_table(state, puzzle=PUZZLE):
+    state = puzzle.as_tiles(state)
+    cols, width = puzzle.cols, len(str(puzzle.cells - 1))
+    for i in range(puzzle.rows):
         row = []
-        for val in state[3*i:3*i+3]:
-            row.append(' ' if val == 0 else str(val))
+        for val in state[cols*i:cols*i+cols]:
+            row.append(' ' * width if val == 0 else str(val).rjust(width))  # blank as space
         print(' '.join(row))
     print()
 
-def get_neighbors(state):
-    neighbors = []
-    zero_pos = state.index(0)
-    row, col = zero_pos // 3, zero_pos % 3
-
-    moves = [(-1,0),(1,0),(0,-1),(0,1)]  # up, down, left, right
-
-    for dr, dc in moves:
-        new_r, new_c = row + dr, col + dc
-        if 0 <= new_r < 3 and 0 <= new_c < 3:
-            new_pos = new_r * 3 + new_c
-            new_state = list(state)
-            new_state[zero_pos], new_state[new_pos] = new_state[new_pos], new_state[zero_pos]
-            neighbors.append(tuple(new_state))
-    return neighbors
+def get_neighbors(state, puzzle=PUZZLE):
+    return puzzle.neighbors(state)
 
-def dfs(start, goal):
-    stack = [start]
-    visited = set()
+def dfs_steps(start, goal, max_depth=None, visited=None, stack=None, puzzle=None, stats=None):
+    # Iterative DFS that yields (state, depth) for every expanded state and
+    # returns the path (or None) as its StopIteration value. Callers can
+    # stream progress and stop early just by not iterating further; pass
+    # visited/stack in to inspect them afterwards. States deeper than
+    # max_depth are not expanded. stats: optional search_stats.SearchStats.
+    puzzle = puzzle_for(start, puzzle)
+    start, goal = puzzle.as_state(start), puzzle.as_state(goal)
+    visited = set() if visited is None else visited
+    stack = [] if stack is None else stack  # (state, depth)
+    stack.append((start, 0))
+    on_stack = {start}  # hashed mirror of the stack for O(1) membership
     parent = {start: None}
+    track = stats is not None
+    expand = stats.timed("neighbors", get_neighbors) if track else get_neighbors
 
     while stack:
-        current = stack.pop()
+        current, depth = stack.pop()
+        on_stack.discard(current)
         if current in visited:
             continue
         visited.add(current)
+        if track:
+            stats.expand(current, len(stack) + 1)
+        yield current, depth
 
         if current == goal:
             # reconstruct path
             path = []
-            while current:
+            while current is not None:
                 path.append(current)
                 current = parent[current]
             path.reverse()
-            return path, visited, stack
+            return path
 
-        for neighbor in get_neighbors(current):
-            if neighbor not in visited and neighbor not in stack:
+        if max_depth is not None and depth >= max_depth:
+            continue
+        successors = expand(current, puzzle)
+        if track:
+            stats.generated += len(successors)
+        for neighbor in successors:
+            if neighbor not in visited and neighbor not in on_stack:
                 parent[neighbor] = current
-                stack.append(neighbor)
+                stack.append((neighbor, depth + 1))
+                on_stack.add(neighbor)
+            elif track:
+                stats.duplicates += 1
+
+    return None  # no solution
 
-    return None, visited, stack  # no solution
+def dfs(start, goal, max_depth=None, puzzle=None, stats=None):
+    visited, stack = set(), []
+    steps = dfs_steps(start, goal, max_depth, visited, stack, puzzle, stats)
+    try:
+        while True:
+            next(steps)
+    except StopIteration as done:
+        path = done.value
+    return path, visited, [state for state, _ in stack]
 
-def input_state(name):
-    print(f"Enter the {name} state row by row (3 numbers each row, space separated). Use 0 or leave blank for empty cell:")
+def input_state(name, puzzle=PUZZLE):
+    cols, last = puzzle.cols, puzzle.cells - 1
+    print(f"Enter the {name} state row by row ({cols} numbers each row, space separated). Use 0 or leave blank for empty cell:")
     vals = []
-    for i in range(3):
+    for i in range(puzzle.rows):
         while True:
             row_input = input(f"Row {i+1}: ").strip().split()
-            if len(row_input) != 3:
-                print("Please enter exactly 3 numbers or blanks.")
+            if len(row_input) != cols:
+                print(f"Please enter exactly {cols} numbers or blanks.")
                 continue
             try:
                 row = []
@@ -65,34 +90,35 @@ def input_state(name):
                         row.append(0)
                     else:
                         val = int(v)
-                        if val < 1 or val > 8:
+                        if val < 1 or val > last:
                             raise ValueError
                         row.append(val)
                 vals.extend(row)
                 break
             except:
-                print("Invalid input. Use numbers 1-8 or 0/blank for empty.")
-    if set(vals) != set(range(9)):
-        print("Invalid state: numbers must be from 0 to 8 without repetition.")
-        return input_state(name)
-    return tuple(vals)
+                print(f"Invalid input. Use numbers 1-{last} or 0/blank for empty.")
+    if set(vals) != set(range(puzzle.cells)):
+        print(f"Invalid state: numbers must be from 0 to {last} without repetition.")
+        return input_state(name, puzzle)
+    return puzzle.encode(vals)
 
-# Input
-start_state = input_state("start")
-goal_state = input_state("goal")
+if __name__ == "__main__":
+    # Input
+    start_state = input_state("start")
+    goal_state = input_state("goal")
 
-# Run DFS
-path, visited, remaining = dfs(start_state, goal_state)
+    # Run DFS
+    path, visited, remaining = dfs(start_state, goal_state)
 
-print(f"\nTotal states visited: {len(visited)}\n")
+    print(f"\nTotal states visited: {len(visited)}\n")
 
-if path:
-    print("Final path length:", len(path))
-    print("Final state:")
-    print_table(path[-1])
-else:
-    print("No solution found.")
+    if path:
+        print("Final path length:", len(path))
+        print("Final state:")
+        print_table(path[-1])
+    else:
+        print("No solution found.")
 
-print("Remaining states in stack (positions of zero):")
-for state in remaining:
-    print(state.index(0), end=" ")
+    print("Remaining states in stack (positions of zero):")
+    for state in remaining:
+        print(blank_pos(state), end=" ")
@@ -1,54 +1,117 @@
-moves = {'U': -3, 'D': 3, 'L': -1, 'R': 1}
+import sys
+from contextlib import nullcontext
 
-print ("Saahya K S")
+from heuristics import get_heuristic
+from sliding_puzzle import PUZZLE, as_tiles, encode, puzzle_for
 
-def is_valid(blank, move):
-    if move == 'L' and blank % 3 == 0: return False
-    if move == 'R' and blank % 3 == 2: return False
-    if move == 'U' and blank < 3: return False
-    if move == 'D' and blank > 5: return False
-    return True
-
-def neighbors(state):
-    blank = state.index(0)
-    result = []
-    for off in moves.values():
-        if is_valid(blank, [k for k,v in moves.items() if v == off][0]):
-            new_state = list(state)
-            swap = blank + off
-            new_state[blank], new_state[swap] = new_state[swap], new_state[blank]
-            result.append(tuple(new_state))
-    return result
-
-def depth_limited_dfs(state, goal, limit, visited):
+def depth_limited_dfs(state, goal, limit, visited, stats=None, puzzle=PUZZLE):
     if state == goal:
         return [state]
     if limit == 0:
         return None
     visited.add(state)
-    for nxt in neighbors(state):
+    successors = puzzle.neighbors(state)
+    if stats is not None:
+        stats.expand(state, len(visited))
+        stats.generated += len(successors)
+    for nxt in successors:
         if nxt not in visited:
-            path = depth_limited_dfs(nxt, goal, limit-1, visited)
+            path = depth_limited_dfs(nxt, goal, limit-1, visited, stats, puzzle)
             if path:
                 return [state] + path
+        elif stats is not None:
+            stats.duplicates += 1
     visited.remove(state)
     return None
 
-def iddfs(start, goal, max_depth=30):
+def depth_limited_ida(board, blank, state, goal, g, threshold, prev, h, path, over, stats=None,
+                      puzzle=PUZZLE):
+    # Same shape as depth_limited_dfs, but the limit is on f = g + h and the
+    # board is one list moved/unmoved in place. Undoing the previous move is
+    # the only cycle pruned, so memory stays O(depth). The smallest f that
+    # overshot the threshold is kept in over[0] for the next iteration.
+    f = g + h(state, goal)
+    if f > threshold:
+        if f < over[0]:
+            over[0] = f
+        return False
+    if state == goal:
+        return True
+    moves = puzzle.move_table[blank]
+    if stats is not None:
+        stats.expand(state, g + 1)
+        stats.generated += len(moves)
+    for _, factor, delta in moves:
+        pos = blank + (delta >> puzzle.blank_shift)
+        if pos == prev:
+            if stats is not None:
+                stats.duplicates += 1
+            continue
+        tile = board[pos]
+        board[blank], board[pos] = tile, 0
+        nxt = state + tile * factor + delta
+        path.append(nxt)
+        if depth_limited_ida(board, pos, nxt, goal, g + 1, threshold, blank, h, path, over, stats,
+                             puzzle):
+            return True
+        path.pop()
+        board[blank], board[pos] = 0, tile
+    return False
+
+def ida_star(start, goal, heuristic="manhattan", max_depth=80, stats=None, puzzle=None):
+    puzzle = puzzle_for(start, puzzle)
+    h = get_heuristic(heuristic, puzzle)
+    if stats is not None:
+        h = stats.timed("heuristic", h)
+    start, goal = puzzle.as_state(start), puzzle.as_state(goal)
+    # Unsolvable pairs are rejected by parity instead of deepening to max_depth
+    if not puzzle.is_solvable(start, goal):
+        return None
+    board = list(puzzle.decode(start))
+    threshold = h(start, goal)
+    while threshold <= max_depth:
+        path = [start]
+        over = [float("inf")]
+        with stats.phase(f"threshold {threshold}") if stats is not None else nullcontext():
+            found = depth_limited_ida(board, puzzle.blank_pos(start), start, goal, 0, threshold, -1, h,
+                                      path, over, stats, puzzle)
+        if found:
+            return path
+        threshold = over[0]
+    return None
+
+def iddfs(start, goal, max_depth=30, heuristic=None, stats=None, puzzle=None):
+    # With a heuristic (name or h(state, goal)) this runs as IDA*. stats, an
+    # optional search_stats.SearchStats, accumulates over all iterations and
+    # times each one as its own phase.
+    if heuristic is not None:
+        return ida_star(start, goal, heuristic, max_depth, stats, puzzle)
+    puzzle = puzzle_for(start, puzzle)
+    start, goal = puzzle.as_state(start), puzzle.as_state(goal)
+    if not puzzle.is_solvable(start, goal):
+        return None
     for depth in range(max_depth+1):
         visited = set()
-        path = depth_limited_dfs(start, goal, depth, visited)
+        with stats.phase(f"depth {depth}") if stats is not None else nullcontext():
+            path = depth_limited_dfs(start, goal, depth, visited, stats, puzzle)
         if path:
             return path
     return None
 
 if __name__ == "__main__":
-    init = tuple(map(int, input("Enter initial state (9 numbers, 0 for blank): ").split()))
-    goal = tuple(map(int, input("Enter goal state (9 numbers, 0 for blank): ").split()))
-    solution = iddfs(init, goal, max_depth=30)
+    print ("Saahya K S")
+    init = encode(tuple(map(int, input("Enter initial state (9 numbers, 0 for blank): ").split())))
+    goal = encode(tuple(map(int, input("Enter goal state (9 numbers, 0 for blank): ").split())))
+    # `python "Iterative Deepening.py" ida [heuristic]` switches to IDA*
+    if len(sys.argv) > 1 and sys.argv[1] == "ida":
+        heuristic = sys.argv[2] if len(sys.argv) > 2 else "manhattan"
+        solution = iddfs(init, goal, max_depth=80, heuristic=heuristic)
+    else:
+        solution = iddfs(init, goal, max_depth=30)
     if solution:
         for i, s in enumerate(solution):
             print("Cost:", i)
+            s = as_tiles(s)
             print(s[0:3])
             print(s[3:6])
             print(s[6:9])
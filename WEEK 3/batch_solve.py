@@ -0,0 +1,137 @@
+# Solve many 8-puzzle instances across a process pool.
+#
+# Each input line holds 18 numbers (start then goal) or 9 numbers (start,
+# solved against --goal); any non-digit characters separate them. Results
+# are written as one JSON object per line, in input order:
+#
+#   python batch_solve.py instances.txt --method astar --heuristic pdb > out.jsonl
+#   cat instances.txt | python batch_solve.py - --method bfs --workers 8
+
+import argparse
+import importlib.util
+import json
+import os
+import re
+import sys
+import time
+from functools import partial
+from multiprocessing import Pool
+
+from heuristics import HEURISTICS
+from search_stats import SearchStats
+from sliding_puzzle import as_tiles, encode, is_solvable
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SOLVER_FILES = {
+    "astar": (os.path.join(HERE, "..", "week 4", "A* misplaced tiles.py"), "astar"),
+    "bfs": (os.path.join(HERE, "bfs non hueristic.py"), "bfs"),
+    "iddfs": (os.path.join(HERE, "Iterative Deepening.py"), "iddfs"),
+}
+DEFAULT_GOAL = (1, 2, 3, 4, 5, 6, 7, 8, 0)
+
+_solvers = {}
+
+def get_solver(method):
+    # The solver scripts have spaces in their names, so load them by path;
+    # each worker process does this once
+    if method not in _solvers:
+        path, func = SOLVER_FILES[method]
+        spec = importlib.util.spec_from_file_location("_batch_" + method, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _solvers[method] = getattr(module, func)
+    return _solvers[method]
+
+def parse_instance(line, goal=DEFAULT_GOAL):
+    nums = [int(x) for x in re.findall(r"\d+", line)]
+    if len(nums) == 9:
+        nums += list(goal)
+    if len(nums) != 18:
+        raise ValueError(f"expected 9 or 18 numbers, got {len(nums)}")
+    start, goal = tuple(nums[:9]), tuple(nums[9:])
+    for state in (start, goal):
+        if sorted(state) != list(range(9)):
+            raise ValueError(f"not a permutation of 0-8: {state}")
+    return start, goal
+
+def solve_instance(job, method="astar", goal=DEFAULT_GOAL, heuristic=None,
+                   max_depth=None, paths=False, detail=False):
+    line_no, line = job
+    result = {"line": line_no, "method": method}
+    try:
+        start, target = parse_instance(line, goal)
+    except ValueError as e:
+        result["error"] = str(e)
+        return result
+    result["start"], result["goal"] = list(start), list(target)
+
+    solver = get_solver(method)
+    stats = SearchStats(timers=detail)  # phase timers only when they are reported
+    t0 = time.perf_counter()
+    if not is_solvable(start, target):
+        path = None
+    elif method == "bfs":
+        path, _, _ = solver(encode(start), encode(target), stats=stats)
+    elif method == "astar":
+        path = solver(encode(start), encode(target), heuristic or "misplaced", stats=stats)
+    else:
+        if max_depth is None:
+            max_depth = 80 if heuristic else 30
+        path = solver(encode(start), encode(target), max_depth, heuristic=heuristic, stats=stats)
+    result["seconds"] = round(time.perf_counter() - t0, 6)
+
+    result["solved"] = path is not None
+    result["moves"] = len(path) - 1 if path else None
+    result["nodes"] = stats.expanded
+    if detail:
+        result["stats"] = stats.to_dict()
+    if paths and path:
+        result["path"] = [list(as_tiles(s)) for s in path]
+    return result
+
+def solve_batch(lines, method="astar", workers=None, chunksize=64, **options):
+    # Yields one result dict per non-blank input line, in input order
+    if method not in SOLVER_FILES:
+        raise ValueError(f"Unknown method {method!r}; choose from {', '.join(SOLVER_FILES)}")
+    heuristic = options.get("heuristic")
+    if heuristic is not None and heuristic not in HEURISTICS:
+        # Checked here so a typo fails once, not inside every worker
+        raise ValueError(f"Unknown heuristic {heuristic!r}; choose from {', '.join(HEURISTICS)}")
+    jobs = ((i, line) for i, line in enumerate(lines, 1) if line.strip())
+    work = partial(solve_instance, method=method, **options)
+    if workers == 1:
+        yield from map(work, jobs)
+        return
+    with Pool(workers) as pool:
+        yield from pool.imap(work, jobs, chunksize)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve 8-puzzle instances in bulk.")
+    parser.add_argument("input", nargs="?", default="-", help="instance file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="JSON lines output file, or - for stdout")
+    parser.add_argument("--method", choices=sorted(SOLVER_FILES), default="astar")
+    parser.add_argument("--heuristic", choices=sorted(HEURISTICS),
+                        help="heuristic name for astar / IDA* (iddfs)")
+    parser.add_argument("--goal", default=" ".join(map(str, DEFAULT_GOAL)),
+                        help="goal for lines with only 9 numbers")
+    parser.add_argument("--max-depth", type=int, help="depth limit for iddfs")
+    parser.add_argument("--workers", type=int, help="pool size (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=64)
+    parser.add_argument("--paths", action="store_true", help="include solution paths")
+    parser.add_argument("--stats", action="store_true",
+                        help="include full search counters and phase timings")
+    args = parser.parse_args()
+
+    goal = tuple(int(x) for x in re.findall(r"\d+", args.goal))
+    src = sys.stdin if args.input == "-" else open(args.input)
+    dst = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        for result in solve_batch(src, args.method, args.workers, args.chunksize, goal=goal,
+                                  heuristic=args.heuristic, max_depth=args.max_depth,
+                                  paths=args.paths, detail=args.stats):
+            dst.write(json.dumps(result) + "\n")
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
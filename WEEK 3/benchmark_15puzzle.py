@@ -0,0 +1,90 @@
+# 15-puzzle benchmark for the shared sliding-puzzle engines.
+#
+# Scrambles the 4x4 goal with seeded random walks and solves every instance
+# with A* and IDA* under each heuristic, reporting time and expanded nodes,
+# plus peak traced memory with --memory (tracing slows the solvers down, so
+# timings from that run are not comparable). Pattern databases are built (or
+# loaded) up front so their one-off cost is shown separately.
+#
+#   python benchmark_15puzzle.py --instances 10 --moves 40 --seed 0 [--memory]
+
+import argparse
+import importlib.util
+import os
+import random
+import time
+import tracemalloc
+
+from heuristics import get_heuristic
+from search_stats import SearchStats
+from sliding_puzzle import get_puzzle
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def load_script(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def scramble(puzzle, moves, rng):
+    state, prev = puzzle.goal, None
+    for _ in range(moves):
+        choices = [n for n in puzzle.neighbors(state) if n != prev]
+        prev, state = state, rng.choice(choices)
+    return state
+
+def measure(solve, trace_memory=False):
+    if trace_memory:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    path = solve()
+    seconds = time.perf_counter() - t0
+    peak = 0
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return path, seconds, peak
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark A* and IDA* on the 15-puzzle.")
+    parser.add_argument("--instances", type=int, default=10)
+    parser.add_argument("--moves", type=int, default=40, help="random-walk scramble length")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--memory", action="store_true", help="trace peak memory (slow)")
+    args = parser.parse_args()
+    count, moves, seed = args.instances, args.moves, args.seed
+
+    puzzle = get_puzzle(4, 4)
+    astar = load_script(os.path.join(HERE, "..", "week 4", "A* misplaced tiles.py"), "astar_script").astar
+    ida_star = load_script(os.path.join(HERE, "Iterative Deepening.py"), "iddfs_script").ida_star
+
+    t0 = time.perf_counter()
+    get_heuristic("pdb", puzzle)(puzzle.goal, puzzle.goal)
+    print(f"Pattern databases ready in {time.perf_counter() - t0:.2f}s")
+
+    rng = random.Random(seed)
+    instances = [scramble(puzzle, moves, rng) for _ in range(count)]
+    print(f"{count} instances, {moves}-move random walks, seed {seed}\n")
+
+    solvers = []
+    for name in ("manhattan", "linear_conflict", "pdb"):
+        solvers.append((f"A* {name}", astar, name))
+        solvers.append((f"IDA* {name}", ida_star, name))
+
+    print(f"{'solver':<22}{'avg moves':>10}{'avg nodes':>12}{'total s':>10}{'peak MiB':>10}"
+          f"{'nodes/s':>10}")
+    for label, solver, name in solvers:
+        total_s = peak_mem = 0
+        lengths, nodes = [], []
+        for start in instances:
+            stats = SearchStats(timers=False)
+            path, seconds, peak = measure(
+                lambda: solver(start, puzzle.goal, name, stats=stats, puzzle=puzzle), args.memory)
+            total_s += seconds
+            peak_mem = max(peak_mem, peak)
+            lengths.append(len(path) - 1)
+            nodes.append(stats.expanded)
+        memory = f"{peak_mem / 2 ** 20:.2f}" if args.memory else "-"
+        print(f"{label:<22}{sum(lengths) / count:>10.1f}{sum(nodes) / count:>12.0f}"
+              f"{total_s:>10.2f}{memory:>10}{sum(nodes) / total_s:>10.0f}")
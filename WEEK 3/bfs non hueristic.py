@@ -1,66 +1,130 @@
 from collections import deque
 
-def print_table(state):
-    for i in range(3):
+from distance_table import load_distance_table, solve_with_table
+from sliding_puzzle import PUZZLE, blank_pos, puzzle_for
+
+def print_table(state, puzzle=PUZZLE):
+    state = puzzle.as_tiles(state)
+    cols, width = puzzle.cols, len(str(puzzle.cells - 1))
+    for i in range(puzzle.rows):
         row = []
-        for val in state[3*i:3*i+3]:
-            if val == 0:
-                row.append(' ')  # show blank as space
-            else:
-                row.append(str(val))
+        for val in state[cols*i:cols*i+cols]:
+            row.append(' ' * width if val == 0 else str(val).rjust(width))  # blank as space
         print(' '.join(row))
     print()
 
-def get_neighbors(state):
-    neighbors = []
-    zero_pos = state.index(0)
-    row, col = zero_pos // 3, zero_pos % 3
-
-    moves = [(-1,0),(1,0),(0,-1),(0,1)]  # up, down, left, right
-
-    for dr, dc in moves:
-        new_r, new_c = row + dr, col + dc
-        if 0 <= new_r < 3 and 0 <= new_c < 3:
-            new_pos = new_r * 3 + new_c
-            new_state = list(state)
-            new_state[zero_pos], new_state[new_pos] = new_state[new_pos], new_state[zero_pos]
-            neighbors.append(tuple(new_state))
-    return neighbors
+def get_neighbors(state, puzzle=PUZZLE):
+    return puzzle.neighbors(state)
 
-def bfs(start, goal):
+def bfs(start, goal, bidirectional=False, puzzle=None, stats=None):
+    # stats: optional search_stats.SearchStats to fill in
+    puzzle = puzzle_for(start, puzzle)
+    start, goal = puzzle.as_state(start), puzzle.as_state(goal)
+    # Unsolvable pairs are rejected by parity instead of exhausting the space
+    if not puzzle.is_solvable(start, goal):
+        return None, set([start]), deque()
+    # A prebuilt distance table for this goal answers directly
+    table = load_distance_table(goal, puzzle=puzzle)
+    if table is not None:
+        visited = set()
+        path = solve_with_table(start, goal, table, puzzle, stats, visited)
+        return path, visited, deque()
+    if bidirectional:
+        return bidirectional_bfs(start, goal, puzzle, stats)
     queue = deque([start])
     visited = set([start])
     parent = {start: None}
+    track = stats is not None
+    expand = stats.timed("neighbors", get_neighbors) if track else get_neighbors
 
     while queue:
         current = queue.popleft()
+        if track:
+            stats.expand(current, len(queue) + 1)
 
         if current == goal:
             # Found goal, reconstruct path
             path = []
-            while current:
+            while current is not None:
                 path.append(current)
                 current = parent[current]
             path.reverse()
             return path, visited, queue
 
-        for neighbor in get_neighbors(current):
+        successors = expand(current, puzzle)
+        if track:
+            stats.generated += len(successors)
+        for neighbor in successors:
             if neighbor not in visited:
                 visited.add(neighbor)
                 parent[neighbor] = current
                 queue.append(neighbor)
+            elif track:
+                stats.duplicates += 1
 
     return None, visited, queue  # no solution found
 
-def input_state(name):
-    print(f"Enter the {name} state row by row (3 numbers each row, space separated). Use 0 or leave blank for empty cell:")
+def bidirectional_bfs(start, goal, puzzle=None, stats=None):
+    puzzle = puzzle_for(start, puzzle)
+    start, goal = puzzle.as_state(start), puzzle.as_state(goal)
+    if start == goal:
+        return [start], set([start]), deque()
+    # Index 0 grows from start, index 1 from goal; each side maps
+    # state -> (parent, depth). The smaller frontier is expanded one full
+    # layer at a time and the cheapest meeting point in that layer wins.
+    parents = ({start: (None, 0)}, {goal: (None, 0)})
+    frontiers = ([start], [goal])
+    track = stats is not None
+    expand = stats.timed("neighbors", get_neighbors) if track else get_neighbors
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        mine, other = parents[side], parents[1 - side]
+        best, meet = None, None
+        next_layer = []
+        for current in frontiers[side]:
+            depth = mine[current][1] + 1
+            successors = expand(current, puzzle)
+            if track:
+                stats.expand(current, len(frontiers[0]) + len(frontiers[1]) + len(next_layer))
+                stats.generated += len(successors)
+            for neighbor in successors:
+                if neighbor in mine:
+                    if track:
+                        stats.duplicates += 1
+                    continue
+                mine[neighbor] = (current, depth)
+                next_layer.append(neighbor)
+                if neighbor in other and (best is None or depth + other[neighbor][1] < best):
+                    best, meet = depth + other[neighbor][1], neighbor
+        frontiers[side][:] = next_layer
+        if meet is not None:
+            return (_join_paths(parents, meet), set(parents[0]) | set(parents[1]),
+                    deque(frontiers[0] + frontiers[1]))
+    return None, set(parents[0]) | set(parents[1]), deque()
+
+def _join_paths(parents, meet):
+    path = []
+    current = meet
+    while current is not None:
+        path.append(current)
+        current = parents[0][current][0]
+    path.reverse()
+    current = parents[1][meet][0]
+    while current is not None:
+        path.append(current)
+        current = parents[1][current][0]
+    return path
+
+def input_state(name, puzzle=PUZZLE):
+    cols, last = puzzle.cols, puzzle.cells - 1
+    print(f"Enter the {name} state row by row ({cols} numbers each row, space separated). Use 0 or leave blank for empty cell:")
     vals = []
-    for i in range(3):
+    for i in range(puzzle.rows):
         while True:
             row_input = input(f"Row {i+1}: ").strip().split()
             # Allow blank input for zero
-            if len(row_input) != 3:
-                print("Please enter exactly 3 numbers or blanks.")
+            if len(row_input) != cols:
+                print(f"Please enter exactly {cols} numbers or blanks.")
                 continue
             try:
                 row = []
@@ -69,34 +133,36 @@ def input_state(name):
                         row.append(0)
                     else:
                         val = int(v)
-                        if val < 1 or val > 8:
+                        if val < 1 or val > last:
                             raise ValueError
                         row.append(val)
                 vals.extend(row)
                 break
             except:
-                print("Invalid input. Use numbers 1-8 or 0/blank for empty.")
-    if set(vals) != set(range(9)):
-        print("Invalid state: numbers must be from 0 to 8 without repetition.")
-        return input_state(name)
-    return tuple(vals)
-
-# Input from user
-start_state = input_state("start")
-goal_state = input_state("goal")
-
-# Run BFS
-path, visited, remaining = bfs(start_state, goal_state)
-
-print(f"\nTotal states visited: {len(visited)}\n")
-
-if path:
-    print("Final path length:", len(path))
-    print("Final state:")
-    print_table(path[-1])
-else:
-    print("No solution found.")
-
-print("Remaining states in queue (positions of zero):")
-for state in remaining:
-    print(state.index(0), end=" ")
+                print(f"Invalid input. Use numbers 1-{last} or 0/blank for empty.")
+    if set(vals) != set(range(puzzle.cells)):
+        print(f"Invalid state: numbers must be from 0 to {last} without repetition.")
+        return input_state(name, puzzle)
+    return puzzle.encode(vals)
+
+if __name__ == "__main__":
+    # Input from user
+    start_state = input_state("start")
+    goal_state = input_state("goal")
+    bidirectional = input("Search from both ends (bidirectional BFS)? [y/N]: ").strip().lower() == "y"
+
+    # Run BFS
+    path, visited, remaining = bfs(start_state, goal_state, bidirectional)
+
+    print(f"\nTotal states visited: {len(visited)}\n")
+
+    if path:
+        print("Final path length:", len(path))
+        print("Final state:")
+        print_table(path[-1])
+    else:
+        print("No solution found.")
+
+    print("Remaining states in queue (positions of zero):")
+    for state in remaining:
+        print(blank_pos(state), end=" ")
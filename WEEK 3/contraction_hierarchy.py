@@ -0,0 +1,301 @@
+# Contraction hierarchies for repeated point-to-point UCS queries.
+#
+# Offline, nodes are contracted one at a time in order of importance (edge
+# difference plus already-contracted neighbours, updated lazily). Contracting
+# v adds a shortcut u->w of cost c(u,v) + c(v,w) unless a short witness search
+# finds another u->w path at most that cheap. Every edge then points from a
+# lower-ranked node to a higher one ("up") or the other way ("down"), and a
+# query only has to search up from the start and, backwards, up from the goal.
+# Shortcuts remember their middle node so paths unpack to original edges.
+#
+# The hierarchy is saved in the same aligned, memory-mapped style as .csr files:
+#
+#   python contraction_hierarchy.py roads.csr roads.ch
+
+import heapq
+import itertools
+import mmap
+import os
+import struct
+import sys
+import weakref
+from array import array
+
+from graph_csr import CSRGraph, _typecode, as_csr, load_edge_list, open_csr
+
+MAGIC = b"UCSCH02\0"
+# magic, nodes, up edges, down edges, source edges, source edge checksum, weight typecode
+HEADER = struct.Struct("<8sQQQQQc7x")
+INF = float("inf")
+
+def _witness_costs(out, source, skip, limit, max_settled):
+    # Dijkstra from source that ignores skip, stops past limit or after
+    # max_settled nodes; a missed witness only costs an extra shortcut
+    dist = {source: 0}
+    pq = [(0, source)]
+    settled = 0
+    while pq and settled < max_settled:
+        cost, node = heapq.heappop(pq)
+        if cost > dist[node]:
+            continue
+        if cost > limit:
+            break
+        settled += 1
+        for neighbor, edge_cost in out[node].items():
+            new_cost = cost + edge_cost
+            if neighbor != skip and new_cost < dist.get(neighbor, INF):
+                dist[neighbor] = new_cost
+                heapq.heappush(pq, (new_cost, neighbor))
+    return dist
+
+def _shortcuts(out, inn, v, max_settled):
+    found = []
+    for u, cu in inn[v].items():
+        via = {w: cu + cw for w, cw in out[v].items() if w != u}
+        if not via:
+            continue
+        dist = _witness_costs(out, u, v, max(via.values()), max_settled)
+        for w, cost in via.items():
+            if dist.get(w, INF) > cost:
+                found.append((u, w, cost))
+    return found
+
+def _pack(edge_lists, code, names):
+    # Per-node [(target, cost, middle), ...] lists -> CSRGraph plus middle array
+    offsets = array("q", [0])
+    targets, weights, middle = array("i"), array(code), array("i")
+    for edges in edge_lists:
+        for target, cost, mid in edges:
+            targets.append(target)
+            weights.append(cost)
+            middle.append(mid)
+        offsets.append(len(targets))
+    return CSRGraph(offsets, targets, weights, names.offsets, names.blob), middle
+
+class ContractionHierarchy:
+    def __init__(self, rank, up, up_middle, down, down_middle, source=(0, 0)):
+        self.rank = rank            # contraction order of each node
+        self.up = up                # u -> v edges with rank[u] < rank[v]
+        self.up_middle = up_middle  # shortcut middle node, -1 for original edges
+        self.down = down            # stored at v: u -> v edges with rank[u] > rank[v]
+        self.down_middle = down_middle
+        self.source = source        # (edge count, checksum) of the graph it was built from
+
+    def built_from(self, graph):
+        return (len(self) == len(graph)
+                and self.source == (graph.edge_count, graph.checksum()))
+
+    def __len__(self):
+        return len(self.rank)
+
+    def _middle(self, a, b):
+        # Middle node of hierarchy edge a -> b (-1 for an original edge)
+        if self.rank[a] < self.rank[b]:
+            graph, middle, node, other = self.up, self.up_middle, a, b
+        else:
+            graph, middle, node, other = self.down, self.down_middle, b, a
+        best, mid = INF, -1
+        for k in range(graph.offsets[node], graph.offsets[node + 1]):
+            if graph.targets[k] == other and graph.weights[k] < best:
+                best, mid = graph.weights[k], middle[k]
+        return mid
+
+    def _unpack(self, path):
+        out = [path[0]]
+        stack = [(b, a) for a, b in zip(path, path[1:])]
+        stack.reverse()
+        while stack:
+            b, a = stack.pop()
+            m = self._middle(a, b)
+            if m < 0:
+                out.append(b)
+            else:
+                stack.append((b, m))
+                stack.append((m, a))
+        return out
+
+    def query(self, start, goal, stats=None):
+        # (cost, path) like uniform_cost_search: Dijkstra up from the start and
+        # up the down edges from the goal; a side stops once its smallest key
+        # cannot beat the best meeting cost mu
+        if start == goal:
+            return 0, [start]
+        s, t = self.up.node_id(start), self.up.node_id(goal)
+        if s is None or t is None:
+            return float("inf"), []
+        track = stats is not None
+        tie = itertools.count(1)
+        sides = []
+        for g, root in ((self.up, s), (self.down, t)):
+            sides.append((g.offsets, g.targets, g.weights, [(0, 0, root)], {root: 0}, {root: None}))
+        mu, meet = INF, None
+        while True:
+            live = [i for i in (0, 1) if sides[i][3] and sides[i][3][0][0] < mu]
+            if not live:
+                break
+            side = min(live, key=lambda i: sides[i][3][0][0])
+            offsets, targets, weights, pq, best, parent = sides[side]
+            other_best = sides[1 - side][4]
+            cost, _, node = heapq.heappop(pq)
+            if cost > best[node]:
+                continue
+            if track:
+                stats.expand(node, len(sides[0][3]) + len(sides[1][3]) + 1)
+            if node in other_best and cost + other_best[node] < mu:
+                mu, meet = cost + other_best[node], node
+            for k in range(offsets[node], offsets[node + 1]):
+                neighbor = targets[k]
+                new_cost = cost + weights[k]
+                if new_cost < best.get(neighbor, INF):
+                    best[neighbor] = new_cost
+                    parent[neighbor] = node
+                    heapq.heappush(pq, (new_cost, next(tie), neighbor))
+                elif track:
+                    stats.duplicates += 1
+            if track:
+                stats.generated += offsets[node + 1] - offsets[node]
+
+        if meet is None:
+            return float("inf"), []
+        path = []
+        node = meet
+        while node is not None:
+            path.append(node)
+            node = sides[0][5][node]
+        path.reverse()
+        node = sides[1][5][meet]
+        while node is not None:
+            path.append(node)
+            node = sides[1][5][node]
+        return mu, [self.up.name(i) for i in self._unpack(path)]
+
+    def distance(self, start, goal):
+        return self.query(start, goal)[0]
+
+    def save(self, path):
+        names = self.up.names
+        code = _typecode(self.up.weights)
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(self), self.up.edge_count, self.down.edge_count,
+                                *self.source, code.encode()))
+            for table in (self.rank, self.up.offsets, self.up.targets, self.up.weights, self.up_middle,
+                          self.down.offsets, self.down.targets, self.down.weights, self.down_middle,
+                          names.offsets):
+                data = table.tobytes()
+                f.write(data)
+                f.write(b"\0" * (-len(data) % 8))  # keep every table 8-byte aligned
+            f.write(bytes(names.blob))
+
+def build_hierarchy(graph, max_settled=64):
+    # graph: CSRGraph or {node: [(neighbor, cost), ...]} dict. Parallel edges
+    # keep their cheapest cost and self-loops are dropped.
+    graph = as_csr(graph)
+    n = len(graph)
+    out = [{} for _ in range(n)]
+    inn = [{} for _ in range(n)]
+    for u in range(n):
+        for v, cost in graph.neighbors(u):
+            if v != u and cost < out[u].get(v, INF):
+                out[u][v] = inn[v][u] = cost
+    middle = {}
+    deleted = [0] * n  # contracted neighbours, spreads contraction evenly
+
+    def priority(v):
+        found = _shortcuts(out, inn, v, max_settled)
+        return len(found) - len(inn[v]) - len(out[v]) + deleted[v], found
+
+    heap = [(priority(v)[0], v) for v in range(n)]
+    heapq.heapify(heap)
+    rank = array("i", bytes(4 * n))
+    up_edges = [[] for _ in range(n)]
+    down_edges = [[] for _ in range(n)]
+    order = 0
+    while heap:
+        _, v = heapq.heappop(heap)
+        p, found = priority(v)
+        if heap and p > heap[0][0]:
+            heapq.heappush(heap, (p, v))  # lazy update: importance went up
+            continue
+        rank[v] = order
+        order += 1
+        for u, w, cost in found:
+            if cost < out[u].get(w, INF):
+                out[u][w] = inn[w][u] = cost
+                middle[u, w] = v
+        for w, cost in out[v].items():
+            up_edges[v].append((w, cost, middle.get((v, w), -1)))
+            del inn[w][v]
+            deleted[w] += 1
+        for u, cost in inn[v].items():
+            down_edges[v].append((u, cost, middle.get((u, v), -1)))
+            del out[u][v]
+            deleted[u] += 1
+        out[v] = inn[v] = None
+
+    code = _typecode(graph.weights)
+    up, up_middle = _pack(up_edges, code, graph.names)
+    down, down_middle = _pack(down_edges, code, graph.names)
+    return ContractionHierarchy(rank, up, up_middle, down, down_middle,
+                                (graph.edge_count, graph.checksum()))
+
+def open_hierarchy(path):
+    # Memory-mapped ContractionHierarchy saved by ContractionHierarchy.save
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, n, m_up, m_down, m_source, crc, code = HEADER.unpack_from(mm)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a contraction hierarchy file")
+    code = code.decode()
+    view = memoryview(mm)
+    pos = HEADER.size
+    tables = []
+    layout = (("i", n), ("q", n + 1), ("i", m_up), (code, m_up), ("i", m_up),
+              ("q", n + 1), ("i", m_down), (code, m_down), ("i", m_down), ("q", n + 1))
+    sizes = [array(typecode).itemsize * count for typecode, count in layout]
+    if pos + sum(size + (-size % 8) for size in sizes) > len(mm):
+        raise ValueError(f"{path} is truncated")
+    for (typecode, _), size in zip(layout, sizes):
+        tables.append(view[pos:pos + size].cast(typecode))
+        pos += size + (-size % 8)
+    rank, u_off, u_tgt, u_w, up_middle, d_off, d_tgt, d_w, down_middle, name_offsets = tables
+    if pos + name_offsets[n] != len(mm):
+        raise ValueError(f"{path} is truncated")
+    blob = view[pos:]
+    return ContractionHierarchy(rank, CSRGraph(u_off, u_tgt, u_w, name_offsets, blob), up_middle,
+                                CSRGraph(d_off, d_tgt, d_w, name_offsets, blob), down_middle,
+                                (m_source, crc))
+
+_built = weakref.WeakKeyDictionary()
+
+def hierarchy_for(graph):
+    # Hierarchy for a CSRGraph, built on first use and kept for as long as
+    # the graph object lives
+    if graph not in _built:
+        _built[graph] = build_hierarchy(graph)
+    return _built[graph]
+
+def load_or_build_hierarchy(graph, path):
+    # Reuses the file at path unless it is missing, truncated, in an older
+    # format, or was built from a different (or since edited) graph
+    graph = as_csr(graph)
+    if os.path.exists(path):
+        try:
+            hierarchy = open_hierarchy(path)
+        except (ValueError, struct.error):
+            hierarchy = None
+        if hierarchy is not None and hierarchy.built_from(graph):
+            return hierarchy
+    hierarchy = build_hierarchy(graph)
+    hierarchy.save(path)
+    return hierarchy
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("usage: python contraction_hierarchy.py GRAPH(.csr or edge list) OUT.ch")
+        sys.exit(1)
+    graph_file = sys.argv[1]
+    graph = open_csr(graph_file) if graph_file.endswith(".csr") else load_edge_list(graph_file)
+    hierarchy = build_hierarchy(graph)
+    hierarchy.save(sys.argv[2])
+    print(f"Wrote {sys.argv[2]}: {len(hierarchy)} nodes, {hierarchy.up.edge_count} up and "
+          f"{hierarchy.down.edge_count} down edges ({graph.edge_count} original)")
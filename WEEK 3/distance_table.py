@@ -0,0 +1,122 @@
+# Exact sliding-puzzle distances for a fixed goal, one byte per reachable
+# state.
+#
+# A retrograde BFS from the goal stores every distance in a file indexed by
+# permutation rank (181,440 bytes for the 8-puzzle). Loaded tables are
+# memory-mapped, and solve_with_table() walks downhill through them, so every
+# query is answered optimally with about 4 lookups per move.
+#
+#   python distance_table.py 1 2 3 4 5 6 7 8 0    # build for that goal
+
+import mmap
+import os
+import sys
+from collections import deque
+from functools import lru_cache
+from math import factorial
+
+from sliding_puzzle import PUZZLE, puzzle_for
+
+TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+UNSEEN = 0xff
+
+_loaded = {}
+
+@lru_cache(maxsize=None)
+def _factorials(cells):
+    return [factorial(cells - 1 - i) for i in range(cells)]
+
+def rank(state, puzzle=PUZZLE):
+    # Lehmer rank of the tile -> cell permutation (blank first), halved.
+    # The dropped last digit only tells apart states that differ by swapping
+    # the two highest tiles, and exactly one of those two is reachable, so
+    # the halved rank is unique within the goal's reachable half.
+    cells, mask = puzzle.cells, puzzle.mask
+    fact = _factorials(cells)
+    pos = [0] * cells
+    for i, sh in enumerate(puzzle.shifts):
+        pos[(state >> sh) & mask] = i
+    used = 0
+    r = 0
+    for i in range(cells):
+        p = pos[i]
+        r += (p - (used & ((1 << p) - 1)).bit_count()) * fact[i]
+        used |= 1 << p
+    return r >> 1
+
+def table_path(goal, directory=TABLE_DIR, puzzle=PUZZLE):
+    tiles = puzzle.as_tiles(goal)
+    return os.path.join(directory, "dist_%dx%d_%s.bin" % (puzzle.rows, puzzle.cols, "-".join(map(str, tiles))))
+
+def build_distance_table(goal, directory=TABLE_DIR, puzzle=PUZZLE):
+    # Only sensible for small boards: the table has cells!/2 entries
+    goal = puzzle.as_state(goal)
+    table = bytearray([UNSEEN]) * (factorial(puzzle.cells) // 2)
+    table[rank(goal, puzzle)] = 0
+    queue = deque([goal])
+    while queue:
+        state = queue.popleft()
+        d = table[rank(state, puzzle)] + 1
+        for nxt in puzzle.neighbors(state):
+            r = rank(nxt, puzzle)
+            if table[r] == UNSEEN:
+                table[r] = d
+                queue.append(nxt)
+    path = table_path(goal, directory, puzzle)
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(table)
+    _loaded.pop(path, None)
+    return load_distance_table(goal, directory, puzzle)
+
+def load_distance_table(goal, directory=TABLE_DIR, puzzle=PUZZLE):
+    # Memory-mapped table for goal, or None if it has not been built (or the
+    # file is not a complete cells!/2-byte table, which a rebuild replaces)
+    path = table_path(goal, directory, puzzle)
+    if path not in _loaded:
+        if not os.path.exists(path) or os.path.getsize(path) != factorial(puzzle.cells) // 2:
+            return None
+        with open(path, "rb") as f:
+            _loaded[path] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return _loaded[path]
+
+def solve_with_table(start, goal, table, puzzle=PUZZLE, stats=None, visited=None):
+    # stats: optional SearchStats; each step of the walk counts as one
+    # expansion and the lookups are timed as the "table" phase.
+    # visited: optional set that collects every state the walk looks up.
+    start, goal = puzzle.as_state(start), puzzle.as_state(goal)
+    track = stats is not None
+    if track:
+        stats.table_hits += 1
+    if not puzzle.is_solvable(start, goal):
+        return None
+    expand, lookup = puzzle.neighbors, rank
+    if track:
+        expand, lookup = stats.timed("neighbors", expand), stats.timed("table", lookup)
+    path = [start]
+    state = start
+    if visited is not None:
+        visited.add(start)
+    d = table[lookup(state, puzzle)]
+    while d:
+        successors = expand(state)
+        if track:
+            stats.expand(state, 1)
+            stats.generated += len(successors)
+        for nxt in successors:
+            if visited is not None:
+                visited.add(nxt)
+            if table[lookup(nxt, puzzle)] == d - 1:
+                state = nxt
+                break
+        else:
+            raise ValueError(f"Distance table for this goal is corrupt: no neighbour at distance {d - 1}")
+        path.append(state)
+        d -= 1
+    return path
+
+if __name__ == "__main__":
+    goal = tuple(map(int, sys.argv[1:])) or (1, 2, 3, 4, 5, 6, 7, 8, 0)
+    puzzle = puzzle_for(goal)
+    table = build_distance_table(goal, puzzle=puzzle)
+    print("Wrote", table_path(goal, puzzle=puzzle), "- max distance", max(table[:]))
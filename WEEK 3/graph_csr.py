@@ -0,0 +1,215 @@
+# Compact graphs for uniform cost search on large edge lists.
+#
+# A CSRGraph stores adjacency in compressed-sparse-row form: for node i its
+# edges are targets[offsets[i]:offsets[i+1]] with matching weights. Nodes are
+# interned to ints numbered in sorted-name order, so names can be looked up
+# by binary search instead of needing a dict. All tables are flat `array`s,
+# or memoryviews over an mmapped .csr file, which opens without parsing
+# anything.
+#
+#   python graph_csr.py roads.txt roads.csr [--undirected]
+
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+
+MAGIC = b"UCSCSR1\0"
+HEADER = struct.Struct("<8sQQc7x")  # magic, nodes, edges, weight typecode
+
+class _Names:
+    # Sequence view of node names packed into one UTF-8 blob
+    def __init__(self, offsets, blob):
+        self.offsets, self.blob = offsets, blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]).decode()
+
+class CSRGraph:
+    def __init__(self, offsets, targets, weights, name_offsets, name_blob):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.names = _Names(name_offsets, name_blob)
+        self._reverse = None
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def edge_count(self):
+        return len(self.targets)
+
+    def node_id(self, name):
+        i = bisect_left(self.names, name)
+        if i < len(self.names) and self.names[i] == name:
+            return i
+        return None
+
+    def name(self, i):
+        return self.names[i]
+
+    def neighbors(self, i):
+        a, b = self.offsets[i], self.offsets[i + 1]
+        return zip(self.targets[a:b], self.weights[a:b])
+
+    def get(self, name, default=()):
+        # dict-of-lists compatible view: [(neighbor name, cost), ...]
+        i = self.node_id(name)
+        if i is None:
+            return default
+        return [(self.names[j], c) for j, c in self.neighbors(i)]
+
+    def checksum(self):
+        # CRC-32 of the edge tables, so files derived from the graph
+        # (landmarks, hierarchies) can tell when it has changed
+        crc = zlib.crc32(_typecode(self.weights).encode())
+        for table in (self.offsets, self.targets, self.weights):
+            crc = zlib.crc32(table, crc)
+        return crc
+
+    def reverse(self):
+        # Same nodes with every edge flipped (built once, then cached), for
+        # searches that run backwards from the goal
+        if self._reverse is None:
+            n, m = len(self), self.edge_count
+            offsets = array("q", bytes(8 * (n + 1)))
+            for v in self.targets:
+                offsets[v + 1] += 1
+            for i in range(n):
+                offsets[i + 1] += offsets[i]
+            fill = array("q", offsets[:n])
+            targets = array("i", bytes(4 * m))
+            code = _typecode(self.weights)
+            weights = array(code, bytes(array(code).itemsize * m))
+            for u in range(n):
+                for k in range(self.offsets[u], self.offsets[u + 1]):
+                    v = self.targets[k]
+                    j = fill[v]
+                    targets[j], weights[j] = u, self.weights[k]
+                    fill[v] = j + 1
+            self._reverse = CSRGraph(offsets, targets, weights, self.names.offsets, self.names.blob)
+            self._reverse._reverse = self
+        return self._reverse
+
+    def save(self, path):
+        name_offsets, blob = self.names.offsets, self.names.blob
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(self), self.edge_count, _typecode(self.weights).encode()))
+            for table in (self.offsets, self.targets, self.weights, name_offsets):
+                data = table.tobytes()
+                f.write(data)
+                f.write(b"\0" * (-len(data) % 8))  # keep every table 8-byte aligned
+            f.write(bytes(blob))
+
+def _typecode(table):
+    return table.format if isinstance(table, memoryview) else table.typecode
+
+def open_csr(path):
+    # Memory-mapped CSRGraph; nothing is read until it is touched
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, n, m, code = HEADER.unpack_from(mm)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a CSR graph file")
+    view = memoryview(mm)
+    pos = HEADER.size
+    tables = []
+    for typecode, count in (("q", n + 1), ("i", m), (code.decode(), m), ("q", n + 1)):
+        size = array(typecode).itemsize * count
+        tables.append(view[pos:pos + size].cast(typecode))
+        pos += size + (-size % 8)
+    offsets, targets, weights, name_offsets = tables
+    return CSRGraph(offsets, targets, weights, name_offsets, view[pos:])
+
+def build_csr(edges, undirected=False):
+    # edges: iterable of (u, v, cost). Edge order per node is kept, so the
+    # search breaks ties exactly as it does on the dict-of-lists graph.
+    ids = {}
+    src, dst = array("i"), array("i")
+    costs = array("d")
+    all_int = True
+    for u, v, c in edges:
+        iu = ids.setdefault(u, len(ids))
+        iv = ids.setdefault(v, len(ids))
+        all_int = all_int and isinstance(c, int)
+        src.append(iu)
+        dst.append(iv)
+        costs.append(c)
+        if undirected:
+            src.append(iv)
+            dst.append(iu)
+            costs.append(c)
+    weights_in = array("q", map(int, costs)) if all_int else costs
+
+    # Renumber nodes in sorted-name order so lookups can bisect
+    names = sorted(ids)
+    remap = array("i", bytes(4 * len(names)))
+    for new, name in enumerate(names):
+        remap[ids[name]] = new
+    del ids
+
+    n, m = len(names), len(src)
+    offsets = array("q", bytes(8 * (n + 1)))
+    for u in src:
+        offsets[remap[u] + 1] += 1
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+    fill = array("q", offsets[:n])
+    targets = array("i", bytes(4 * m))
+    weights = array(weights_in.typecode, bytes(weights_in.itemsize * m))
+    for u, v, c in zip(src, dst, weights_in):
+        u = remap[u]
+        k = fill[u]
+        targets[k], weights[k] = remap[v], c
+        fill[u] = k + 1
+
+    blobs = [name.encode() for name in names]
+    name_offsets = array("q", [0])
+    for b in blobs:
+        name_offsets.append(name_offsets[-1] + len(b))
+    return CSRGraph(offsets, targets, weights, name_offsets, b"".join(blobs))
+
+def _parse_cost(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+def read_edges(lines):
+    # "node1 node2 cost" per line (cost defaults to 1); blanks and #-comments skipped
+    for lineno, line in enumerate(lines, 1):
+        parts = line.split()
+        if not parts or parts[0].startswith("#"):
+            continue
+        if len(parts) < 2:
+            raise ValueError(f"line {lineno}: expected 'u v [cost]', got {line.strip()!r}")
+        try:
+            cost = _parse_cost(parts[2]) if len(parts) > 2 else 1
+        except ValueError:
+            raise ValueError(f"line {lineno}: bad cost {parts[2]!r}") from None
+        yield parts[0], parts[1], cost
+
+def load_edge_list(path, undirected=False):
+    with open(path) as f:
+        return build_csr(read_edges(f), undirected)
+
+def from_adjacency(graph):
+    # CSRGraph from the {node: [(neighbor, cost), ...]} dicts the scripts build
+    return build_csr((u, v, c) for u, edges in graph.items() for v, c in edges)
+
+def as_csr(graph):
+    return graph if isinstance(graph, CSRGraph) else from_adjacency(graph)
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("usage: python graph_csr.py EDGE_LIST OUT.csr [--undirected]")
+        sys.exit(1)
+    g = load_edge_list(sys.argv[1], undirected="--undirected" in sys.argv[3:])
+    g.save(sys.argv[2])
+    print(f"Wrote {sys.argv[2]}: {len(g)} nodes, {g.edge_count} edges")
@@ -0,0 +1,219 @@
+# Admissible sliding-puzzle heuristics, looked up by name.
+#
+# Every heuristic is h(state, goal) over encoded states of one board size;
+# get_heuristic(name, puzzle) binds a registry entry to a Puzzle. Goal-dependent
+# tables (Manhattan costs, goal rows/columns, pattern databases) are built on
+# first use and cached per goal; pattern databases for the solved goal are also
+# saved under tables/ so they cost the backward BFS only once (set SAVE_ALL_PDBS
+# to save them for every goal).
+
+import os
+import tempfile
+from bisect import bisect_left
+from collections import deque
+from functools import lru_cache
+
+from sliding_puzzle import PUZZLE
+
+TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+SAVE_ALL_PDBS = False  # True also saves PDBs for non-standard goals (one file set per goal)
+
+# Each make_* takes a Puzzle and returns h(state, goal) for that board size.
+
+def make_misplaced(puzzle):
+    mask, shifts = puzzle.mask, puzzle.shifts
+    def h_misplaced(state, goal):
+        diff = state ^ goal
+        return sum(1 for sh in shifts if (state >> sh) & mask and (diff >> sh) & mask)
+    return h_misplaced
+
+@lru_cache(maxsize=None)
+def _manhattan_table(puzzle, goal):
+    # table[tile][cell] = distance of tile at cell from its goal cell
+    cols, cells = puzzle.cols, puzzle.cells
+    table = [[0] * cells for _ in range(cells)]
+    for home, tile in enumerate(puzzle.decode(goal)):
+        if tile == 0:
+            continue
+        for cell in range(cells):
+            table[tile][cell] = abs(cell // cols - home // cols) + abs(cell % cols - home % cols)
+    return table
+
+def make_manhattan(puzzle):
+    mask, cells = puzzle.mask, list(enumerate(puzzle.shifts))
+    def h_manhattan(state, goal):
+        table = _manhattan_table(puzzle, goal)
+        return sum(table[(state >> sh) & mask][i] for i, sh in cells)
+    return h_manhattan
+
+@lru_cache(maxsize=None)
+def _goal_lines(puzzle, goal):
+    home_row = [0] * puzzle.cells
+    home_col = [0] * puzzle.cells
+    for home, tile in enumerate(puzzle.decode(goal)):
+        home_row[tile], home_col[tile] = home // puzzle.cols, home % puzzle.cols
+    return home_row, home_col
+
+def _line_conflicts(seq):
+    # Tiles that must leave the line: everything outside the longest
+    # increasing run of goal positions
+    tails = []
+    for x in seq:
+        i = bisect_left(tails, x)
+        if i == len(tails):
+            tails.append(x)
+        else:
+            tails[i] = x
+    return len(seq) - len(tails)
+
+def make_linear_conflict(puzzle):
+    rows, cols = puzzle.rows, puzzle.cols
+    manhattan = make_manhattan(puzzle)
+    def h_linear_conflict(state, goal):
+        tiles = puzzle.decode(state)
+        home_row, home_col = _goal_lines(puzzle, goal)
+        extra = 0
+        for r in range(rows):
+            line = tiles[r * cols:(r + 1) * cols]
+            extra += _line_conflicts([home_col[t] for t in line if t and home_row[t] == r])
+        for c in range(cols):
+            line = tiles[c::cols]
+            extra += _line_conflicts([home_row[t] for t in line if t and home_col[t] == c])
+        return manhattan(state, goal) + 2 * extra
+    return h_linear_conflict
+
+# ------------------- PATTERN DATABASES -------------------
+
+def default_partition(rows, cols):
+    # Split tiles 1..n-1 into contiguous groups small enough that the BFS
+    # index (pattern cells plus blank, base n) fits in 32M entries:
+    # 4-4 for the 8-puzzle, 5-5-5 for the 15-puzzle.
+    n = rows * cols
+    k = 1
+    while n ** (k + 2) <= 1 << 25:
+        k += 1
+    tiles = list(range(1, n))
+    groups = -(-len(tiles) // k)
+    size = -(-len(tiles) // groups)
+    return [tuple(tiles[i:i + size]) for i in range(0, len(tiles), size)]
+
+def build_pattern_db(pattern, goal_tiles, rows, cols):
+    """Backward 0-1 BFS from the goal over (pattern cells, blank) states.
+
+    Only moves of pattern tiles cost 1, so databases over disjoint patterns
+    add up to an admissible estimate. Returns a bytearray indexed by
+    sum(cell_of(pattern[j]) * n**j) holding the minimum over blank cells.
+    """
+    n = rows * cols
+    k = len(pattern)
+    adj = []
+    for cell in range(n):
+        r, c = cell // cols, cell % cols
+        adj.append([cell + d for d, ok in ((-cols, r > 0), (cols, r < rows - 1),
+                                           (-1, c > 0), (1, c < cols - 1)) if ok])
+    weights = [n ** (j + 1) for j in range(k)]
+    goal_tiles = list(goal_tiles)
+    start = goal_tiles.index(0) + sum(goal_tiles.index(t) * w for t, w in zip(pattern, weights))
+
+    seen = bytearray(b"\xff") * n ** (k + 1)
+    table = bytearray(b"\xff") * n ** k
+    seen[start] = 0
+    queue = deque([start])
+    while queue:
+        idx = queue.popleft()
+        d = seen[idx]
+        blank, rest = idx % n, idx // n
+        if d < table[rest]:
+            table[rest] = d
+        occupied = {}
+        for w in weights:
+            occupied[rest % n] = w
+            rest //= n
+        for cell in adj[blank]:
+            w = occupied.get(cell)
+            if w is None:
+                nxt, nd = idx - blank + cell, d
+            else:
+                nxt, nd = idx - blank + cell + (blank - cell) * w, d + 1
+            if nd < seen[nxt]:
+                seen[nxt] = nd
+                if nd == d:
+                    queue.appendleft(nxt)
+                else:
+                    queue.append(nxt)
+    return table
+
+def pattern_db(pattern, goal_tiles, rows, cols, directory=TABLE_DIR, save=None):
+    # save: write the table under directory; None saves it only for the
+    # solved goal (1..n-1 then blank) unless SAVE_ALL_PDBS is set
+    n = rows * cols
+    name = "pdb_%dx%d_%s_%s.bin" % (rows, cols, "-".join(map(str, goal_tiles)),
+                                    "-".join(map(str, pattern)))
+    path = os.path.join(directory, name)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) == n ** len(pattern):
+            return data
+        # wrong size: truncated or from elsewhere, so rebuild and replace it
+    table = bytes(build_pattern_db(pattern, goal_tiles, rows, cols))
+    if save is None:
+        save = SAVE_ALL_PDBS or list(goal_tiles) == list(range(1, n)) + [0]
+    if save:
+        # Write a temp file and rename it into place, so a parallel reader
+        # sees either no file or a complete one
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=name + ".")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(table)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    return table
+
+@lru_cache(maxsize=16)
+def _pattern_dbs(puzzle, goal):
+    goal_tiles = puzzle.decode(goal)
+    return [(tuple(reversed(p)), pattern_db(p, goal_tiles, puzzle.rows, puzzle.cols))
+            for p in default_partition(puzzle.rows, puzzle.cols)]
+
+def make_pdb(puzzle):
+    mask, cells, n = puzzle.mask, list(enumerate(puzzle.shifts)), puzzle.cells
+    def h_pdb(state, goal):
+        pos = [0] * n
+        for i, sh in cells:
+            pos[(state >> sh) & mask] = i
+        total = 0
+        for tiles, table in _pattern_dbs(puzzle, goal):
+            idx = 0
+            for t in tiles:
+                idx = idx * n + pos[t]
+            total += table[idx]
+        return total
+    return h_pdb
+
+HEURISTICS = {
+    "misplaced": make_misplaced,
+    "manhattan": make_manhattan,
+    "linear_conflict": make_linear_conflict,
+    "pdb": make_pdb,
+}
+
+@lru_cache(maxsize=None)
+def _bound(name, puzzle):
+    return HEURISTICS[name](puzzle)
+
+def get_heuristic(name, puzzle=PUZZLE):
+    if callable(name):
+        return name
+    if name not in HEURISTICS:
+        raise ValueError(f"Unknown heuristic {name!r}; choose from {', '.join(HEURISTICS)}")
+    return _bound(name, puzzle)
+
+# 3x3 versions under the original names
+h_misplaced = get_heuristic("misplaced")
+h_manhattan = get_heuristic("manhattan")
+h_linear_conflict = get_heuristic("linear_conflict")
+h_pdb = get_heuristic("pdb")
@@ -0,0 +1,158 @@
+# Landmark distances for ALT (A* + landmarks + triangle inequality) search.
+#
+# For a landmark L, d(L, t) <= d(L, v) + d(v, t) and d(v, L) <= d(v, t) + d(t, L),
+# so max(d(L, t) - d(L, v), d(v, L) - d(t, L)) over all landmarks is a
+# consistent lower bound on d(v, t). Landmarks are picked "farthest first" and
+# both distance tables are saved next to the graph, so each graph pays for the
+# 2 * count full Dijkstra runs only once.
+#
+#   python landmarks.py roads.csr [count]     # writes roads.csr.landmarks
+
+import heapq
+import mmap
+import os
+import random
+import struct
+import sys
+import weakref
+from array import array
+
+from graph_csr import load_edge_list, open_csr
+
+MAGIC = b"UCSLMK2\0"
+HEADER = struct.Struct("<8sQQQQ")  # magic, nodes, edges, edge checksum, landmark count
+INF = float("inf")
+
+def distances_from(graph, source):
+    # Full Dijkstra over a CSRGraph: array('d') of costs, inf if unreachable
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    dist = array("d", [INF]) * len(graph)
+    dist[source] = 0
+    pq = [(0, source)]
+    while pq:
+        cost, node = heapq.heappop(pq)
+        if cost > dist[node]:
+            continue
+        for k in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[k]
+            new_cost = cost + weights[k]
+            if new_cost < dist[neighbor]:
+                dist[neighbor] = new_cost
+                heapq.heappush(pq, (new_cost, neighbor))
+    return dist
+
+def select_landmarks(graph, count, seed=0):
+    # Farthest-first: each landmark is the node farthest from those already
+    # chosen (nodes none of them reach count as farthest). Returns the ids and
+    # their forward distance tables, which the selection computes anyway.
+    n = len(graph)
+    count = min(count, n)
+    if count == 0:
+        return [], []
+    far = distances_from(graph, random.Random(seed).randrange(n))
+    ids, forward, chosen = [], [], set()
+    for _ in range(count):
+        best, node = -1, None
+        for v in range(n):
+            if far[v] > best and v not in chosen:
+                best, node = far[v], v
+        ids.append(node)
+        chosen.add(node)
+        dist = distances_from(graph, node)
+        forward.append(dist)
+        if len(ids) == 1:
+            far = array("d", dist)
+        else:
+            for v in range(n):
+                if dist[v] < far[v]:
+                    far[v] = dist[v]
+    return ids, forward
+
+class Landmarks:
+    def __init__(self, ids, forward, backward):
+        self.ids = ids            # landmark node ids
+        self.forward = forward    # forward[i][v] = d(L_i, v)
+        self.backward = backward  # backward[i][v] = d(v, L_i)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def potential(self, target):
+        # h(v) lower-bounding d(v, target); terms involving an unreachable
+        # (inf) distance carry no information and are skipped
+        terms = [(f, b, f[target], b[target]) for f, b in zip(self.forward, self.backward)]
+        def h(v):
+            bound = 0
+            for f, b, ft, bt in terms:
+                fv, bv = f[v], b[v]
+                if ft != INF and fv != INF and ft - fv > bound:
+                    bound = ft - fv
+                if bv != INF and bt != INF and bv - bt > bound:
+                    bound = bv - bt
+            return bound
+        return h
+
+    def save(self, path, graph):
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(graph), graph.edge_count, graph.checksum(), len(self)))
+            f.write(array("q", self.ids).tobytes())
+            for table in self.forward + self.backward:
+                f.write(table.tobytes())
+
+def build_landmarks(graph, count=8, seed=0):
+    ids, forward = select_landmarks(graph, count, seed)
+    reverse = graph.reverse()
+    backward = [distances_from(reverse, i) for i in ids]
+    return Landmarks(ids, forward, backward)
+
+_built = weakref.WeakKeyDictionary()
+
+def landmarks_for(graph):
+    # Default landmarks for a CSRGraph, built on first use and kept for as
+    # long as the graph object lives
+    if graph not in _built:
+        _built[graph] = build_landmarks(graph)
+    return _built[graph]
+
+def open_landmarks(path, graph):
+    # Memory-mapped tables saved by Landmarks.save; None if the file is
+    # missing or was built for a different graph (or an edited version of it)
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        head = f.read(HEADER.size)
+        if len(head) < HEADER.size:
+            return None  # empty or truncated
+        magic, n, m, crc, count = HEADER.unpack(head)
+        if magic != MAGIC or n != len(graph) or m != graph.edge_count or crc != graph.checksum():
+            return None
+        if os.fstat(f.fileno()).st_size != HEADER.size + 8 * count * (1 + 2 * n):
+            return None  # truncated (or padded) tables
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mm)
+    pos = HEADER.size
+    ids = list(view[pos:pos + 8 * count].cast("q"))
+    pos += 8 * count
+    tables = []
+    for _ in range(2 * count):
+        tables.append(view[pos:pos + 8 * n].cast("d"))
+        pos += 8 * n
+    return Landmarks(ids, tables[:count], tables[count:])
+
+def load_or_build_landmarks(graph, path, count=8, seed=0):
+    landmarks = open_landmarks(path, graph)
+    if landmarks is None:
+        landmarks = build_landmarks(graph, count, seed)
+        landmarks.save(path, graph)
+    return landmarks
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("usage: python landmarks.py GRAPH(.csr or edge list) [COUNT]")
+        sys.exit(1)
+    graph_file = sys.argv[1]
+    graph = open_csr(graph_file) if graph_file.endswith(".csr") else load_edge_list(graph_file)
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    landmarks = build_landmarks(graph, count)
+    landmarks.save(graph_file + ".landmarks", graph)
+    print(f"Wrote {graph_file}.landmarks: {len(landmarks)} landmarks over {len(graph)} nodes")
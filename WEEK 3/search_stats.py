@@ -0,0 +1,68 @@
+# Node counters and phase timers shared by the search engines.
+#
+# bfs, dfs, iddfs/IDA*, astar and uniform_cost_search take an optional
+# stats=SearchStats(). With the default None they skip all bookkeeping, so
+# the cost when disabled is one local flag test per expansion. Phase timers
+# wrap the engine's heuristic / neighbour / heap calls only when stats are
+# on, so the timings include the small overhead of the wrappers; pass
+# timers=False to keep only the counters.
+
+import json
+import time
+from contextlib import contextmanager
+
+class SearchStats:
+    def __init__(self, on_expand=None, timers=True):
+        self.expanded = 0       # states taken off the frontier and expanded
+        self.generated = 0      # successors produced
+        self.duplicates = 0     # successors dropped as already seen / no better
+        self.reopened = 0       # closed states pushed again with a better cost
+        self.peak_frontier = 0
+        self.table_hits = 0     # searches answered by walking a distance table
+        self.phase_seconds = {}
+        self.on_expand = on_expand  # optional callback(state) per expansion
+        self.timers = timers
+
+    def expand(self, state, frontier_size):
+        self.expanded += 1
+        if frontier_size > self.peak_frontier:
+            self.peak_frontier = frontier_size
+        if self.on_expand is not None:
+            self.on_expand(state)
+
+    def timed(self, phase, func):
+        # func wrapped so its wall time accumulates under phase_seconds[phase]
+        if not self.timers:
+            return func
+        phases = self.phase_seconds
+        phases.setdefault(phase, 0.0)
+        clock = time.perf_counter
+        def wrapper(*args):
+            t0 = clock()
+            try:
+                return func(*args)
+            finally:
+                phases[phase] += clock() - t0
+        return wrapper
+
+    @contextmanager
+    def phase(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + time.perf_counter() - t0
+
+    def to_dict(self):
+        return {
+            "expanded": self.expanded,
+            "generated": self.generated,
+            "duplicates": self.duplicates,
+            "reopened": self.reopened,
+            "peak_frontier": self.peak_frontier,
+            "table_hits": self.table_hits,
+            "phase_seconds": {k: round(v, 6) for k, v in self.phase_seconds.items()},
+        }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
@@ -0,0 +1,129 @@
+# Multi-query shortest paths over the uniform cost search graphs.
+#
+# A ShortestPathService keeps one resumable Dijkstra tree per source in an
+# LRU cache. A query settles nodes only until its targets are settled and
+# then parks the heap, so a later query for a farther goal from the same
+# source continues where the last one stopped instead of starting over.
+# Cached trees are evicted oldest-first once their total size (reached nodes
+# plus heap entries) passes max_entries.
+#
+# Works on the {node: [(neighbor, cost), ...]} dicts and on graph_csr.CSRGraph
+# (queries use node names either way).
+
+import heapq
+import itertools
+from collections import OrderedDict
+
+from graph_csr import CSRGraph
+
+class DijkstraTree:
+    def __init__(self, adjacency, source):
+        self.adjacency = adjacency  # node -> iterable of (neighbor, cost)
+        self.source = source
+        self.dist = {}              # settled node -> final cost
+        self.best = {source: 0}     # reached node -> best known cost
+        self.parent = {source: None}
+        self._tie = itertools.count()
+        self.heap = [(0, next(self._tie), source)]
+
+    def __len__(self):
+        return len(self.best) + len(self.heap)
+
+    @property
+    def exhausted(self):
+        return not self.heap
+
+    def settle(self, targets):
+        # Expand until every target is settled or nothing is left to expand
+        pending = {t for t in targets if t not in self.dist}
+        heap, dist, best, parent = self.heap, self.dist, self.best, self.parent
+        while pending and heap:
+            cost, _, node = heapq.heappop(heap)
+            if node in dist:
+                continue
+            dist[node] = cost
+            pending.discard(node)
+            for neighbor, edge_cost in self.adjacency(node):
+                new_cost = cost + edge_cost
+                if neighbor not in dist and (neighbor not in best or new_cost < best[neighbor]):
+                    best[neighbor] = new_cost
+                    parent[neighbor] = node
+                    heapq.heappush(heap, (new_cost, next(self._tie), neighbor))
+
+    def path(self, target):
+        if target not in self.dist:
+            return None
+        path = []
+        while target is not None:
+            path.append(target)
+            target = self.parent[target]
+        path.reverse()
+        return path
+
+class ShortestPathService:
+    def __init__(self, graph, max_entries=1_000_000):
+        self.graph = graph
+        self.max_entries = max_entries
+        self.trees = OrderedDict()  # source id -> DijkstraTree, oldest first
+        self.size = 0
+        self.hits = self.misses = 0
+        if isinstance(graph, CSRGraph):
+            self._adjacency = graph.neighbors
+            self._id, self._name = graph.node_id, graph.name
+        else:
+            self._adjacency = lambda node: graph.get(node, ())
+            self._id = self._name = lambda node: node
+
+    def _tree(self, source):
+        tree = self.trees.get(source)
+        if tree is None:
+            self.misses += 1
+            tree = self.trees[source] = DijkstraTree(self._adjacency, source)
+        else:
+            self.hits += 1
+            self.trees.move_to_end(source)
+            self.size -= len(tree)
+        return tree
+
+    def _settle(self, source, targets):
+        tree = self._tree(source)
+        tree.settle(targets)
+        self.size += len(tree)
+        # Evict least recently used trees, never the one just answered
+        while self.size > self.max_entries and len(self.trees) > 1:
+            _, old = self.trees.popitem(last=False)
+            self.size -= len(old)
+        return tree
+
+    def one_to_many(self, source, targets):
+        # {target: (cost, path)} from one settling pass; unreachable
+        # targets get (inf, [])
+        targets = list(targets)
+        sid = self._id(source)
+        ids = {t: self._id(t) for t in targets}
+        if sid is None:
+            return {t: (0, [t]) if t == source else (float("inf"), []) for t in targets}
+        tree = self._settle(sid, [i for i in ids.values() if i is not None])
+        result = {}
+        for t, i in ids.items():
+            if i is not None and i in tree.dist:
+                result[t] = (tree.dist[i], [self._name(n) for n in tree.path(i)])
+            else:
+                result[t] = (float("inf"), [])
+        return result
+
+    def many_to_many(self, sources, targets):
+        # {(source, target): cost}, one pass per distinct source
+        targets = list(targets)
+        table = {}
+        for s in dict.fromkeys(sources):
+            for t, (cost, _) in self.one_to_many(s, targets).items():
+                table[s, t] = cost
+        return table
+
+    def query(self, source, goal):
+        # (cost, path) like uniform_cost_search(graph, source, goal)
+        return self.one_to_many(source, [goal])[goal]
+
+    def distance(self, source, goal):
+        return self.query(source, goal)[0]
@@ -0,0 +1,144 @@
+# Compact sliding-tile states shared by the BFS, DFS, IDDFS and A* solvers.
+#
+# A state is one int: BITS bits per cell (cell i in bits BITS*i ..) and the
+# blank's position in the bits above the board. For the 8-puzzle that is
+# 4 bits per cell and 40 bits in total, so states stay small ints and a
+# neighbour is built with one add from a per-blank move table instead of
+# list/tuple copies.
+#
+# Board geometry lives in a Puzzle; get_puzzle(rows, cols) returns the shared
+# instance for a size. The module-level names below are the 3x3 board the
+# weekly scripts use.
+
+from functools import lru_cache
+from math import isqrt
+
+class Puzzle:
+    def __init__(self, rows, cols):
+        self.rows, self.cols = rows, cols
+        self.cells = rows * cols
+        self.bits = max(4, (self.cells - 1).bit_length())
+        self.mask = (1 << self.bits) - 1
+        self.blank_shift = self.bits * self.cells
+        self.board_mask = (1 << self.blank_shift) - 1
+        self.shifts = [self.bits * i for i in range(self.cells)]
+        # move_table[blank] -> [(shift of the swapped cell, tile multiplier, blank delta)]
+        # Moving tile t from cell p into the blank at b changes the state by
+        # t * (2**shift(b) - 2**shift(p)) + (p - b) << blank_shift.
+        self.move_table = [
+            [(self.shifts[p], (1 << self.shifts[b]) - (1 << self.shifts[p]),
+              (p - b) << self.blank_shift)
+             for p in self.swap_targets(b)]
+            for b in range(self.cells)
+        ]
+        self.goal = self.encode(list(range(1, self.cells)) + [0])
+
+    def __repr__(self):
+        return f"Puzzle({self.rows}, {self.cols})"
+
+    def swap_targets(self, blank):
+        # up, down, left, right - the order the solvers always used
+        row, col = blank // self.cols, blank % self.cols
+        targets = []
+        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            r, c = row + dr, col + dc
+            if 0 <= r < self.rows and 0 <= c < self.cols:
+                targets.append(r * self.cols + c)
+        return targets
+
+    def encode(self, tiles):
+        tiles = list(tiles)
+        if len(tiles) != self.cells:
+            raise ValueError(f"expected {self.cells} tiles for a {self.rows}x{self.cols} board, got {len(tiles)}")
+        state = 0
+        for sh, val in zip(self.shifts, tiles):
+            state |= val << sh
+        return state | (tiles.index(0) << self.blank_shift)
+
+    def decode(self, state):
+        mask = self.mask
+        return tuple((state >> s) & mask for s in self.shifts)
+
+    def as_state(self, state):
+        # Solvers accept either an encoded int or a plain tile tuple/list
+        return state if isinstance(state, int) else self.encode(state)
+
+    def as_tiles(self, state):
+        return self.decode(state) if isinstance(state, int) else tuple(state)
+
+    def blank_pos(self, state):
+        return state >> self.blank_shift
+
+    def tile_at(self, state, pos):
+        return (state >> self.shifts[pos]) & self.mask
+
+    def neighbors(self, state):
+        mask = self.mask
+        result = []
+        for shift, factor, delta in self.move_table[state >> self.blank_shift]:
+            result.append(state + ((state >> shift) & mask) * factor + delta)
+        return result
+
+    def is_solvable(self, start, goal):
+        # Every move is one transposition and moves the blank one step, so the
+        # permutation parity must match the parity of the blank's distance
+        a, b = self.as_tiles(start), self.as_tiles(goal)
+        if sorted(a) != sorted(b):
+            return False
+        ba, bb = a.index(0), b.index(0)
+        blank_dist = abs(ba // self.cols - bb // self.cols) + abs(ba % self.cols - bb % self.cols)
+        return permutation_parity(a, b) == blank_dist & 1
+
+@lru_cache(maxsize=None)
+def get_puzzle(rows, cols=None):
+    return Puzzle(rows, rows if cols is None else cols)
+
+def puzzle_for(state, puzzle=None):
+    # An explicit puzzle wins; a square-length tile sequence picks its own
+    # board; encoded ints without a puzzle are taken as 3x3
+    if puzzle is not None:
+        return puzzle
+    if isinstance(state, int):
+        return PUZZLE
+    side = isqrt(len(state))
+    if side * side != len(state):
+        raise ValueError(f"cannot infer a square board from {len(state)} tiles; pass a Puzzle")
+    return get_puzzle(side, side)
+
+def permutation_parity(tiles, goal_tiles):
+    # Parity of the permutation taking goal_tiles to tiles, from its cycle
+    # count in O(n) rather than counting inversions pairwise
+    home = [0] * len(goal_tiles)
+    for i, t in enumerate(goal_tiles):
+        home[t] = i
+    perm = [home[t] for t in tiles]
+    seen = [False] * len(perm)
+    cycles = 0
+    for i in range(len(perm)):
+        if not seen[i]:
+            cycles += 1
+            while not seen[i]:
+                seen[i] = True
+                i = perm[i]
+    return (len(perm) - cycles) & 1
+
+# ------------------- 3x3 DEFAULTS -------------------
+
+PUZZLE = get_puzzle(3, 3)
+SIZE = 3
+CELLS = PUZZLE.cells
+BITS = PUZZLE.bits
+MASK = PUZZLE.mask
+BLANK_SHIFT = PUZZLE.blank_shift
+BOARD_MASK = PUZZLE.board_mask
+SHIFTS = PUZZLE.shifts
+MOVE_TABLE = PUZZLE.move_table
+
+encode = PUZZLE.encode
+decode = PUZZLE.decode
+as_state = PUZZLE.as_state
+as_tiles = PUZZLE.as_tiles
+blank_pos = PUZZLE.blank_pos
+tile_at = PUZZLE.tile_at
+neighbors = PUZZLE.neighbors
+is_solvable = PUZZLE.is_solvable
@@ -1,58 +1,280 @@
 import heapq
+import itertools
+import sys
 
-def uniform_cost_search(graph, start, goal):
-    # Priority queue: (cost, node, path)
-    pq = [(0, start, [start])]
+from graph_csr import CSRGraph, as_csr, load_edge_list, open_csr
+from contraction_hierarchy import hierarchy_for, load_or_build_hierarchy
+from landmarks import landmarks_for, load_or_build_landmarks
+
+MODES = ("dijkstra", "bidirectional", "alt", "ch")
+
+def reconstruct_path(parent, node):
+    path = []
+    while node is not None:
+        path.append(node)
+        node = parent[node]
+    path.reverse()
+    return path
+
+def uniform_cost_search(graph, start, goal, stats=None, mode="dijkstra", landmarks=None,
+                        hierarchy=None):
+    # Priority queue: (cost, tie, node). The counter keeps equal costs in
+    # push order without comparing nodes; paths come from the parent map.
+    # stats: optional search_stats.SearchStats to fill in. graph is either a
+    # {node: [(neighbor, cost), ...]} dict or a graph_csr.CSRGraph; the other
+    # modes need a CSRGraph (convert a dict once with graph_csr.as_csr).
+    # mode "bidirectional" or "alt" switches to the searches below; "ch"
+    # queries a contraction_hierarchy.ContractionHierarchy (built on the first
+    # query and cached for the graph if none is passed).
+    if mode == "bidirectional":
+        return bidirectional_ucs(graph, start, goal, stats)
+    if mode == "alt":
+        return alt_search(graph, start, goal, landmarks, stats)
+    if mode == "ch":
+        if hierarchy is None:
+            _require_csr(graph, "ch")
+            hierarchy = hierarchy_for(graph)
+        return hierarchy.query(start, goal, stats)
+    if mode != "dijkstra":
+        raise ValueError(f"Unknown mode {mode!r}; choose from {', '.join(MODES)}")
+    if isinstance(graph, CSRGraph):
+        return _uniform_cost_search_csr(graph, start, goal, stats)
+    track = stats is not None
+    push, pop = heapq.heappush, heapq.heappop
+    if track:
+        push, pop = stats.timed("heap", push), stats.timed("heap", pop)
+    tie = itertools.count()
+    pq = [(0, next(tie), start)]
+    best = {start: 0}
+    parent = {start: None}
     visited = set()
 
     while pq:
-        cost, node, path = heapq.heappop(pq)
+        cost, _, node = pop(pq)
 
         # If node already visited, skip
         if node in visited:
             continue
         visited.add(node)
+        if track:
+            stats.expand(node, len(pq) + 1)
 
         # Goal test
         if node == goal:
-            return cost, path
+            return cost, reconstruct_path(parent, node)
 
-        # Explore neighbors
+        # Explore neighbors, skipping pushes that cannot improve a known cost
         for neighbor, edge_cost in graph.get(node, []):
-            if neighbor not in visited:
-                heapq.heappush(pq, (cost + edge_cost, neighbor, path + [neighbor]))
+            new_cost = cost + edge_cost
+            if neighbor not in visited and (neighbor not in best or new_cost < best[neighbor]):
+                best[neighbor] = new_cost
+                parent[neighbor] = node
+                push(pq, (new_cost, next(tie), neighbor))
+            elif track:
+                stats.duplicates += 1
+            if track:
+                stats.generated += 1
 
     return float("inf"), []  # No path found
 
-# ------------------- USER INPUT -------------------
-graph = {}
+def _uniform_cost_search_csr(graph, start, goal, stats=None):
+    # Same loop over interned int ids and flat CSR arrays; only the nodes the
+    # search touches get dict entries, so large graphs cost nothing up front
+    if start == goal:
+        return 0, [start]
+    s, t = graph.node_id(start), graph.node_id(goal)
+    if s is None or t is None:
+        return float("inf"), []
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    track = stats is not None
+    push, pop = heapq.heappush, heapq.heappop
+    if track:
+        push, pop = stats.timed("heap", push), stats.timed("heap", pop)
+    tie = itertools.count()
+    pq = [(0, next(tie), s)]
+    best = {s: 0}
+    parent = {s: None}
+    visited = set()
+
+    while pq:
+        cost, _, node = pop(pq)
+        if node in visited:
+            continue
+        visited.add(node)
+        if track:
+            stats.expand(node, len(pq) + 1)
+        if node == t:
+            return cost, [graph.name(i) for i in reconstruct_path(parent, node)]
+        for k in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[k]
+            new_cost = cost + weights[k]
+            if neighbor not in visited and (neighbor not in best or new_cost < best[neighbor]):
+                best[neighbor] = new_cost
+                parent[neighbor] = node
+                push(pq, (new_cost, next(tie), neighbor))
+            elif track:
+                stats.duplicates += 1
+        if track:
+            stats.generated += offsets[node + 1] - offsets[node]
+
+    return float("inf"), []
+
+def _require_csr(graph, mode):
+    # Converting a dict graph costs more than the faster modes save on one
+    # query, so callers convert once and reuse the CSRGraph
+    if not isinstance(graph, CSRGraph):
+        raise TypeError(f"mode {mode!r} needs a CSRGraph; convert the graph once with graph_csr.as_csr")
+
+def bidirectional_ucs(graph, start, goal, stats=None):
+    # Dijkstra from the start and, on the reversed graph, from the goal,
+    # always expanding the smaller frontier. mu is the cheapest start->goal
+    # path seen where the two searches touch; once the two frontier minimums
+    # add up to mu nothing cheaper is left. graph must be a CSRGraph.
+    _require_csr(graph, "bidirectional")
+    if start == goal:
+        return 0, [start]
+    s, t = graph.node_id(start), graph.node_id(goal)
+    if s is None or t is None:
+        return float("inf"), []
+    track = stats is not None
+    sides = []
+    for g, root in ((graph, s), (graph.reverse(), t)):
+        sides.append((g.offsets, g.targets, g.weights, [(0, 0, root)], {root: 0}, {root: None}, set()))
+    tie = itertools.count(1)
+    mu, meet = float("inf"), None
+
+    while sides[0][3] and sides[1][3]:
+        if sides[0][3][0][0] + sides[1][3][0][0] >= mu:
+            break
+        side = 0 if len(sides[0][3]) <= len(sides[1][3]) else 1
+        offsets, targets, weights, pq, best, parent, visited = sides[side]
+        other_best = sides[1 - side][4]
+        cost, _, node = heapq.heappop(pq)
+        if node in visited:
+            continue
+        visited.add(node)
+        if track:
+            stats.expand(node, len(sides[0][3]) + len(sides[1][3]) + 1)
+        for k in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[k]
+            new_cost = cost + weights[k]
+            if neighbor not in visited and (neighbor not in best or new_cost < best[neighbor]):
+                best[neighbor] = new_cost
+                parent[neighbor] = node
+                heapq.heappush(pq, (new_cost, next(tie), neighbor))
+            elif track:
+                stats.duplicates += 1
+            if neighbor in other_best and best[neighbor] + other_best[neighbor] < mu:
+                mu, meet = best[neighbor] + other_best[neighbor], neighbor
+        if track:
+            stats.generated += offsets[node + 1] - offsets[node]
+
+    if meet is None:
+        return float("inf"), []
+    path = reconstruct_path(sides[0][5], meet)
+    node = sides[1][5][meet]
+    while node is not None:
+        path.append(node)
+        node = sides[1][5][node]
+    return mu, [graph.name(i) for i in path]
+
+def alt_search(graph, start, goal, landmarks=None, stats=None):
+    # A* with landmark lower bounds (see landmarks.py). The bound is
+    # consistent, so closed nodes never need reopening. Pass landmarks from
+    # load_or_build_landmarks to reuse saved tables; without them a default
+    # set is built on the first call and cached for the graph. graph must be
+    # a CSRGraph.
+    _require_csr(graph, "alt")
+    if start == goal:
+        return 0, [start]
+    s, t = graph.node_id(start), graph.node_id(goal)
+    if s is None or t is None:
+        return float("inf"), []
+    if landmarks is None:
+        landmarks = landmarks_for(graph)
+    h = landmarks.potential(t)
+    track = stats is not None
+    if track:
+        h = stats.timed("heuristic", h)
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    tie = itertools.count()
+    pq = [(h(s), next(tie), 0, s)]
+    best = {s: 0}
+    parent = {s: None}
+    visited = set()
+
+    while pq:
+        _, _, cost, node = heapq.heappop(pq)
+        if node in visited:
+            continue
+        visited.add(node)
+        if track:
+            stats.expand(node, len(pq) + 1)
+        if node == t:
+            return cost, [graph.name(i) for i in reconstruct_path(parent, node)]
+        for k in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[k]
+            new_cost = cost + weights[k]
+            if neighbor not in visited and (neighbor not in best or new_cost < best[neighbor]):
+                best[neighbor] = new_cost
+                parent[neighbor] = node
+                heapq.heappush(pq, (new_cost + h(neighbor), next(tie), new_cost, neighbor))
+            elif track:
+                stats.duplicates += 1
+        if track:
+            stats.generated += offsets[node + 1] - offsets[node]
+
+    return float("inf"), []
+
+if __name__ == "__main__":
+    # ------------------- USER INPUT -------------------
+    # Optional --bidirectional / --alt / --ch pick the search mode
+    flags = [a for a in sys.argv[1:] if a.startswith("--")]
+    files = [a for a in sys.argv[1:] if not a.startswith("--")]
+    mode = next((m for m in MODES[1:] if "--" + m in flags), "dijkstra")
+    graph_file = files[0] if files else None
+    if graph_file:
+        # Bulk load: an edge-list file ("node1 node2 cost" per line) or a
+        # graph saved by graph_csr.py, which is memory-mapped
+        graph = open_csr(graph_file) if graph_file.endswith(".csr") else load_edge_list(graph_file)
+    else:
+        graph = {}
 
-# Take number of edges
-n = int(input("Enter number of edges: "))
+        # Take number of edges
+        n = int(input("Enter number of edges: "))
 
-print("Enter edges in the format: node1 node2 cost")
-for _ in range(n):
-    u, v, c = input().split()
-    c = int(c)
+        print("Enter edges in the format: node1 node2 cost")
+        for _ in range(n):
+            u, v, c = input().split()
+            c = int(c)
 
-    # Add edge (for undirected or directed graph)
-    if u not in graph:
-        graph[u] = []
-    graph[u].append((v, c))
+            # Add edge (for undirected or directed graph)
+            if u not in graph:
+                graph[u] = []
+            graph[u].append((v, c))
 
-# If you want to make it undirected, uncomment the next 3 lines:
-#    if v not in graph:
-#        graph[v] = []
-#    graph[v].append((u, c))
+        # If you want to make it undirected, uncomment the next 3 lines:
+        #    if v not in graph:
+        #        graph[v] = []
+        #    graph[v].append((u, c))
 
-start = input("Enter start node: ")
-goal = input("Enter goal node: ")
+    start = input("Enter start node: ")
+    goal = input("Enter goal node: ")
 
-# ------------------- RUN UCS -------------------
-cost, path = uniform_cost_search(graph, start, goal)
+    # ------------------- RUN UCS -------------------
+    landmarks = hierarchy = None
+    if mode != "dijkstra":
+        graph = as_csr(graph)
+    if graph_file and mode == "alt":
+        # Landmark tables and hierarchies are saved next to the graph and reused
+        landmarks = load_or_build_landmarks(graph, graph_file + ".landmarks")
+    if graph_file and mode == "ch":
+        hierarchy = load_or_build_hierarchy(graph, graph_file + ".ch")
+    cost, path = uniform_cost_search(graph, start, goal, mode=mode, landmarks=landmarks,
+                                     hierarchy=hierarchy)
 
-if path:
-    print(f"\nLeast-cost path: {' -> '.join(path)}")
-    print(f"Total cost: {cost}")
-else:
-    print("\nNo path found!")
+    if path:
+        print(f"\nLeast-cost path: {' -> '.join(path)}")
+        print(f"Total cost: {cost}")
+    else:
+        print("\nNo path found!")
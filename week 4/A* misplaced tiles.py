@@ -1,55 +1,85 @@
 import heapq
+import itertools
+import os
+import sys
 
-print("Saahya K S")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "WEEK 3"))
+from distance_table import load_distance_table, solve_with_table
+from heuristics import get_heuristic
+from sliding_puzzle import as_tiles, encode, puzzle_for
 
-moves = {'U': -3, 'D': 3, 'L': -1, 'R': 1}
+def reconstruct_path(parent, state):
+    path = []
+    while state is not None:
+        path.append(state)
+        state = parent[state]
+    path.reverse()
+    return path
 
-def is_valid(blank, move):
-    if move == 'L' and blank % 3 == 0: return False
-    if move == 'R' and blank % 3 == 2: return False
-    if move == 'U' and blank < 3: return False
-    if move == 'D' and blank > 5: return False
-    return True
-
-def neighbors(state):
-    blank = state.index(0)
-    result = []
-    for off in moves.values():
-        if is_valid(blank, [k for k,v in moves.items() if v == off][0]):
-            new_state = list(state)
-            swap = blank + off
-            new_state[blank], new_state[swap] = new_state[swap], new_state[blank]
-            result.append(tuple(new_state))
-    return result
-
-def h_misplaced(state, goal):
-    return sum(1 for i in range(9) if state[i] != 0 and state[i] != goal[i])
-
-def astar(start, goal):
-    open_heap = []
-    heapq.heappush(open_heap, (h_misplaced(start, goal), 0, start, [start]))
-    visited = set()
+def astar(start, goal, heuristic="misplaced", stats=None, puzzle=None):
+    # heuristic: a name from heuristics.HEURISTICS or any h(state, goal).
+    # stats: optional search_stats.SearchStats to fill in.
+    puzzle = puzzle_for(start, puzzle)
+    h = get_heuristic(heuristic, puzzle)
+    start, goal = puzzle.as_state(start), puzzle.as_state(goal)
+    # A prebuilt distance table for this goal answers directly
+    table = load_distance_table(goal, puzzle=puzzle)
+    if table is not None:
+        return solve_with_table(start, goal, table, puzzle, stats)
+    track = stats is not None
+    expand, push, pop = puzzle.neighbors, heapq.heappush, heapq.heappop
+    if track:
+        h = stats.timed("heuristic", h)
+        expand = stats.timed("neighbors", expand)
+        push, pop = stats.timed("heap", push), stats.timed("heap", pop)
+    # Heap entries are (f, g, tie, state); the insertion counter breaks f/g
+    # ties so states are never compared, and paths are rebuilt from parent.
+    tie = itertools.count()
+    open_heap = [(h(start, goal), 0, next(tie), start)]
+    parent = {start: None}
+    best_g = {start: 0}
+    closed = set()
+    path = None
     while open_heap:
-        f, g, state, path = heapq.heappop(open_heap)
+        f, g, _, state = pop(open_heap)
+        if g > best_g[state]:
+            continue  # stale entry, a cheaper push of this state exists
         if state == goal:
-            return path
-        if state in visited:
-            continue
-        visited.add(state)
-        for nxt in neighbors(state):
-            if nxt not in visited:
-                new_g = g + 1
-                new_f = new_g + h_misplaced(nxt, goal)
-                heapq.heappush(open_heap, (new_f, new_g, nxt, path + [nxt]))
-    return None
+            path = reconstruct_path(parent, state)
+            break
+        closed.add(state)
+        if track:
+            stats.expand(state, len(open_heap) + 1)
+        new_g = g + 1
+        successors = expand(state)
+        if track:
+            stats.generated += len(successors)
+        for nxt in successors:
+            if new_g >= best_g.get(nxt, new_g + 1):
+                if track:
+                    stats.duplicates += 1
+                continue  # dominated by an earlier push
+            if nxt in closed:
+                # only happens with an inconsistent heuristic
+                closed.discard(nxt)
+                if track:
+                    stats.reopened += 1
+            best_g[nxt] = new_g
+            parent[nxt] = state
+            push(open_heap, (new_g + h(nxt, goal), new_g, next(tie), nxt))
+    return path
 
 if __name__ == "__main__":
-    init = tuple(map(int, input("Enter initial state (9 numbers, 0 for blank): ").split()))
-    goal = tuple(map(int, input("Enter goal state (9 numbers, 0 for blank): ").split()))
-    solution = astar(init, goal)
+    print("Saahya K S")
+    init = encode(tuple(map(int, input("Enter initial state (9 numbers, 0 for blank): ").split())))
+    goal = encode(tuple(map(int, input("Enter goal state (9 numbers, 0 for blank): ").split())))
+    # Optional heuristic name on the command line, e.g. `manhattan` or `pdb`
+    heuristic = sys.argv[1] if len(sys.argv) > 1 else "misplaced"
+    solution = astar(init, goal, heuristic)
     if solution:
         for i, s in enumerate(solution):
             print("Cost:", i)
+            s = as_tiles(s)
             print(s[0:3])
             print(s[3:6])
             print(s[6:9])
@@ -1,14 +1,15 @@
+import os
 import random
+import sys
+import time
+from functools import partial
+from multiprocessing import Event, Pool
+
+from queens import QueensBoard, Step, run, trace, use_vectorized
 
 def calculate_attacks(state):
-    """Heuristic: count number of attacking pairs."""
-    attacks = 0
-    n = len(state)
-    for i in range(n):
-        for j in range(i + 1, n):
-            if state[i] == state[j] or abs(state[i] - state[j]) == abs(i - j):
-                attacks += 1
-    return attacks
+    """Heuristic: count number of attacking pairs (O(n) via line counts)."""
+    return QueensBoard(state).attacks
 
 def print_board(state):
     """Print board row by row with '_' for empty and 'Q' for queen."""
@@ -29,51 +30,151 @@ def get_neighbors(state):
                 neighbors.append(neighbor)
     return neighbors
 
-def hill_climbing_verbose(n, initial_state=None, max_iter=1000):
+def hill_climbing_steps(n, initial_state=None, max_iter=1000, vectorized=None):
+    """Steepest-ascent core: yields a Step per move (step 0 is the starting
+    board) and returns why it stopped. Prints nothing; vectorized=True
+    scores moves with NumPy, and the default None does so above
+    queens.VECTORIZE_ABOVE queens when NumPy is installed."""
     if initial_state is None:
         current = [random.randint(0, n - 1) for _ in range(n)]
     else:
         current = list(initial_state)
 
-    current_attacks = calculate_attacks(current)
+    # Score every single-queen move in O(1) from the board's line counts
+    board = QueensBoard(current)
+    if vectorized is None:
+        vectorized = use_vectorized(n)
+    best_move = board.best_move_vectorized if vectorized else board.best_move
     step = 0
-
-    print(f"\nInitial state (Step {step}): cost = {current_attacks}")
-    print_board(current)
+    yield Step(step, board.attacks, None, board.state)
 
     while step < max_iter:
-        neighbors = get_neighbors(current)
-        if not neighbors:
-            break
-
-        best = min(neighbors, key=calculate_attacks)
-        best_attacks = calculate_attacks(best)
+        move = best_move()
+        if move is None:
+            return "no moves"
 
-        if best_attacks >= current_attacks:
-            print("\nNo better neighbor found. Local optimum reached.")
-            break
+        delta, col, row = move
+        if delta >= 0:
+            return "local optimum"
 
         step += 1
-        current, current_attacks = best, best_attacks
+        board.move(col, row)
+        yield Step(step, board.attacks, (col, row), board.state)
+
+        if board.attacks == 0:
+            return "solution"
+    return "step limit"
+
+def hill_climbing(n, initial_state=None, max_iter=1000, vectorized=None):
+    """Silent fast path: (final state, attacking pairs)."""
+    last, _ = run(hill_climbing_steps(n, initial_state, max_iter, vectorized))
+    return last.state, last.cost
+
+def hill_climbing_verbose(n, initial_state=None, max_iter=1000, vectorized=None,
+                          every=1, interval=0.0):
+    """Hill climbing with a printed trace; every / interval thin it out (see queens.trace)."""
+    def show(event):
+        if event.step == 0:
+            print(f"\nInitial state (Step {event.step}): cost = {event.cost}")
+        else:
+            print(f"Step {event.step}: cost = {event.cost}")
+        print_board(event.state)
 
-        print(f"Step {step}: cost = {current_attacks}")
-        print_board(current)
+    last, reason = trace(hill_climbing_steps(n, initial_state, max_iter, vectorized),
+                         show, every, interval)
+    if reason == "local optimum":
+        print("\nNo better neighbor found. Local optimum reached.")
+    elif reason == "solution":
+        print("Found a solution!\n")
 
-        if current_attacks == 0:
-            print("Found a solution!\n")
+    print("Final state (array form):", last.state)
+    print("Final attacking pairs (cost):", last.cost)
+
+def climb(board, max_iter=1000, max_sideways=0, rng=random, stop=None):
+    """Steepest ascent on board in place, allowing up to max_sideways
+    consecutive equal-cost moves (ties broken at random). Returns steps taken."""
+    steps = sideways = 0
+    while steps < max_iter and board.attacks:
+        if stop is not None and stop.is_set():
+            break
+        delta, moves = board.best_moves()
+        if not moves or delta > 0 or (delta == 0 and sideways >= max_sideways):
             break
+        sideways = sideways + 1 if delta == 0 else 0
+        board.move(*rng.choice(moves))
+        steps += 1
+    return steps
+
+def random_restart_hill_climbing(n, max_restarts=100, max_sideways=100, max_iter=1000,
+                                 seed=None, stop=None):
+    """Climb with sideways moves, restarting from a random board at each local
+    optimum until a board has no attacks. stop is an optional Event that
+    cancels the run. Returns the best board found and how long it took."""
+    rng = random.Random(seed)
+    t0 = time.perf_counter()
+    best, steps = None, 0
+    for restarts in range(max_restarts + 1):
+        board = QueensBoard(rng.randrange(n) for _ in range(n))
+        steps += climb(board, max_iter, max_sideways, rng, stop)
+        if best is None or board.attacks < best.attacks:
+            best = board
+        if best.attacks == 0 or (stop is not None and stop.is_set()):
+            break
+    return {"state": best.state, "attacks": best.attacks, "seed": seed, "restarts": restarts,
+            "steps": steps, "seconds": time.perf_counter() - t0}
+
+# ------------------- PARALLEL MULTI-START -------------------
 
-    print("Final state (array form):", current)
-    print("Final attacking pairs (cost):", current_attacks)
+_stop = None
+
+def _init_worker(event):
+    global _stop
+    _stop = event
+
+def _climb_seed(seed, n, options):
+    return random_restart_hill_climbing(n, seed=seed, stop=_stop, **options)
+
+def parallel_hill_climbing(n, workers=None, seed=0, tasks=None, **options):
+    """Run independently seeded random-restart climbs across a process pool.
+    The first zero-attack board wins and the other climbs are cancelled.
+    seconds in the result is wall time to that first solution."""
+    workers = workers or os.cpu_count()
+    tasks = tasks or workers
+    stop = Event()
+    t0 = time.perf_counter()
+    best = None
+    with Pool(workers, initializer=_init_worker, initargs=(stop,)) as pool:
+        climbs = pool.imap_unordered(partial(_climb_seed, n=n, options=options),
+                                     range(seed, seed + tasks))
+        for result in climbs:
+            if best is None or result["attacks"] < best["attacks"]:
+                best = result
+            if result["attacks"] == 0:
+                stop.set()
+                break
+    best["seconds"] = time.perf_counter() - t0
+    best["workers"] = workers
+    return best
 
 if __name__ == "__main__":
-    N = int(input("Enter N (number of queens): ").strip())
-    s = input("Enter initial state as N space-separated integers (rows 0..N-1), or press Enter for random initial state:\n").strip()
-    initial = None
-    if s:
-        parts = list(map(int, s.split()))
-        if len(parts) == N and all(0 <= x < N for x in parts):
-            initial = parts
-        else:
-            print("Invalid initial state, using random.")
-    hill_climbing_verbose(N, initial_state=initial)
+    if "--restarts" in sys.argv:
+        # python "Hill Climbing.py" --restarts: parallel random-restart climbs
+        N = int(input("Enter N (number of queens): ").strip())
+        result = parallel_hill_climbing(N)
+        print("Final state (array form):", result["state"])
+        print("Final attacking pairs (cost):", result["attacks"])
+        print(f"Seed {result['seed']}: {result['restarts']} restarts, {result['steps']} steps, "
+              f"{result['seconds']:.3f}s on {result['workers']} workers")
+    else:
+        N = int(input("Enter N (number of queens): ").strip())
+        s = input("Enter initial state as N space-separated integers (rows 0..N-1), or press Enter for random initial state:\n").strip()
+        initial = None
+        if s:
+            parts = list(map(int, s.split()))
+            if len(parts) == N and all(0 <= x < N for x in parts):
+                initial = parts
+            else:
+                print("Invalid initial state, using random.")
+        # python "Hill Climbing.py" --numpy always scores moves with NumPy
+        # (by default it is used only for large boards)
+        hill_climbing_verbose(N, initial_state=initial, vectorized=True if "--numpy" in sys.argv else None)
@@ -0,0 +1,71 @@
+# N-Queens benchmark for the week 5 local search solvers.
+#
+# Runs random-restart hill climbing, simulated annealing and min-conflicts on
+# each board size with seeded runs, reporting how many runs found a solution,
+# mean time and mean steps. Hill climbing is O(n^2) per step and simulated
+# annealing needs ever longer schedules, so both are skipped above their
+# --hc-max / --sa-max sizes; min-conflicts runs on every size.
+#
+#   python benchmark_queens.py --sizes 8,64,512,4096,32768,262144,1000000 --runs 3
+
+import argparse
+import importlib.util
+import os
+import random
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def load_script(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def run_annealing(simulated_annealing, n, seed):
+    # Geometric cooling from T=1 stretched over 1000n steps
+    steps = 1000 * n
+    random.seed(seed)
+    t0 = time.perf_counter()
+    _, attacks = simulated_annealing(n, max_steps=steps, initial_temp=1.0,
+                                     cooling_rate=1 - 8 / steps)
+    return {"attacks": attacks, "steps": None, "seconds": time.perf_counter() - t0}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the N-Queens local search solvers.")
+    parser.add_argument("--sizes", default="8,64,512,4096,32768,262144,1000000")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--hc-max", type=int, default=256, help="largest n for hill climbing")
+    parser.add_argument("--sa-max", type=int, default=512, help="largest n for simulated annealing")
+    args = parser.parse_args()
+    sizes = [int(x) for x in args.sizes.split(",")]
+
+    climbing = load_script(os.path.join(HERE, "Hill Climbing.py"), "hill_climbing_script")
+    annealing = load_script(os.path.join(HERE, "simulated annealing.py"), "annealing_script")
+    conflicts = load_script(os.path.join(HERE, "min conflicts.py"), "min_conflicts_script")
+
+    solvers = [
+        ("hill climbing", args.hc_max,
+         lambda n, seed: climbing.random_restart_hill_climbing(n, seed=seed)),
+        ("simulated annealing", args.sa_max,
+         lambda n, seed: run_annealing(annealing.simulated_annealing, n, seed)),
+        ("min-conflicts", None,
+         lambda n, seed: conflicts.min_conflicts(n, seed=seed)),
+    ]
+
+    print(f"{args.runs} runs per size, seeds from {args.seed}\n")
+    print(f"{'solver':<22}{'n':>9}{'solved':>9}{'avg s':>10}{'avg steps':>12}")
+    for n in sizes:
+        for label, max_n, solve in solvers:
+            if max_n is not None and n > max_n:
+                print(f"{label:<22}{n:>9}{'-':>9}{'-':>10}{'-':>12}")
+                continue
+            results = [solve(n, args.seed + i) for i in range(args.runs)]
+            solved = sum(r["attacks"] == 0 for r in results)
+            seconds = sum(r["seconds"] for r in results) / args.runs
+            steps = "-"
+            if results[0]["steps"] is not None:
+                steps = f"{sum(r['steps'] for r in results) / args.runs:.0f}"
+            print(f"{label:<22}{n:>9}{f'{solved}/{args.runs}':>9}{seconds:>10.3f}{steps:>12}",
+                  flush=True)
@@ -0,0 +1,155 @@
+import random
+import time
+from array import array
+
+from queens import QueensBoard
+
+class _IndexedSet:
+    # Subset of range(n) as a list plus positions: O(1) add, discard and
+    # random draw
+    def __init__(self, n):
+        self.items, self.where = [], array("i", [-1]) * n
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def add(self, x):
+        if self.where[x] < 0:
+            self.where[x] = len(self.items)
+            self.items.append(x)
+
+    def discard(self, x):
+        i = self.where[x]
+        if i >= 0:
+            last = self.items[-1]
+            self.items[i], self.where[last] = last, i
+            self.items.pop()
+            self.where[x] = -1
+
+    def choice(self, rng):
+        return self.items[rng.randrange(len(self.items))]
+
+def greedy_placement(n, rng=random, tries=32):
+    """Board with one queen per row: each column takes the first of `tries`
+    random unused rows that no placed queen attacks diagonally, or the least
+    attacked of them."""
+    state = [0] * n
+    diags = [0] * (2 * n - 1)
+    antis = [0] * (2 * n - 1)
+    free = list(range(n))
+    for col in range(n):
+        best_i = best = None
+        for _ in range(min(tries, len(free))):
+            i = rng.randrange(len(free))
+            row = free[i]
+            hits = diags[row - col + n - 1] + antis[row + col]
+            if best is None or hits < best:
+                best_i, best = i, hits
+                if hits == 0:
+                    break
+        row = free[best_i]
+        free[best_i] = free[-1]
+        free.pop()
+        state[col] = row
+        diags[row - col + n - 1] += 1
+        antis[row + col] += 1
+    return QueensBoard(state)
+
+def min_conflicts(n, max_steps=None, seed=None, sample=100, initial_state=None):
+    """Min-conflicts local search for N-Queens.
+
+    Repeatedly takes a random conflicted queen and moves it to its
+    least-conflicted other row (random tie-break; always moving keeps a pair
+    of queens from both staying put on a plateau forever). Rows are all
+    scanned when n <= 10 * sample; otherwise the empty rows plus `sample`
+    random rows are tried, stopping at the first conflict-free one.
+
+    The conflicted-queen set is kept up to date incrementally: every line
+    also stores the sum of its queens' columns, so the queen a move newly
+    conflicts with is found in O(1); queens that stop being conflicted are
+    dropped lazily when drawn. Returns the final board and its cost.
+    """
+    rng = random.Random(seed)
+    t0 = time.perf_counter()
+    if initial_state is None:
+        board = greedy_placement(n, rng)
+    else:
+        board = QueensBoard(initial_state)
+    if max_steps is None:
+        max_steps = 50 * n + 1000
+    state, rows, diags, antis = board.state, board.rows, board.diags, board.antis
+    lines = (rows, diags, antis)
+    sums = (array("q", bytes(8 * n)), array("q", bytes(8 * (2 * n - 1))),
+            array("q", bytes(8 * (2 * n - 1))))
+    row_sum, diag_sum, anti_sum = sums
+    for col, row in enumerate(state):
+        row_sum[row] += col
+        diag_sum[row - col + n - 1] += col
+        anti_sum[row + col] += col
+
+    conflicted, empty = _IndexedSet(n), _IndexedSet(n)
+    for col in range(n):
+        if board.conflicts(col, state[col]):
+            conflicted.add(col)
+    for row in range(n):
+        if rows[row] == 0:
+            empty.add(row)
+
+    full_scan = n <= 10 * sample
+    steps = 0
+    while conflicted and steps < max_steps:
+        col = conflicted.choice(rng)
+        old = state[col]
+        if board.conflicts(col, old) == 0:
+            conflicted.discard(col)
+            continue
+        steps += 1
+        best, choices = None, []
+        if full_scan:
+            candidates = range(n)
+        else:
+            # Empty rows are where zero-conflict squares usually are
+            candidates = list(empty) + [rng.randrange(n) for _ in range(sample)]
+        for row in candidates:
+            if row == old:
+                continue
+            hits = rows[row] + diags[row - col + n - 1] + antis[row + col]
+            if best is None or hits < best:
+                best, choices = hits, [row]
+                if hits == 0 and not full_scan:
+                    break
+            elif hits == best:
+                choices.append(row)
+        if not choices:
+            continue
+        row = rng.choice(choices)
+        keys = (old, old - col + n - 1, old + col), (row, row - col + n - 1, row + col)
+        for line, total, key in zip(lines, sums, keys[1]):
+            if line[key] == 1:
+                conflicted.add(total[key])  # the queen alone on this line now has company
+        board.move(col, row)
+        if rows[old] == 0:
+            empty.add(old)
+        empty.discard(row)
+        for total, key_old, key_new in zip(sums, keys[0], keys[1]):
+            total[key_old] -= col
+            total[key_new] += col
+        if best == 0:
+            conflicted.discard(col)
+    return {"state": state, "attacks": board.attacks, "seed": seed, "steps": steps,
+            "seconds": time.perf_counter() - t0}
+
+if __name__ == "__main__":
+    N = int(input("Enter N (number of queens): ").strip())
+    result = min_conflicts(N)
+    if N <= 20:
+        print("Final State:", result["state"])
+    print("Attacking pairs:", result["attacks"])
+    print(f"{result['steps']} steps in {result['seconds']:.3f}s")
+    if result["attacks"] == 0:
+        print("Found a solution!")
+    else:
+        print("Did not find solution (step limit).")
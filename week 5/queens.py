@@ -0,0 +1,171 @@
+import time
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: only best_move_vectorized() needs it
+    np = None
+
+# One local-search event: step number, attacking pairs after it, the
+# (col, row) move made (None for the starting board) and the live state list
+Step = namedtuple("Step", "step cost move state")
+
+# Above this many queens best_move_vectorized() beats the O(n^2) pure-Python
+# best_move() scan (about 10x at n = 256) and picks the same move
+VECTORIZE_ABOVE = 16
+
+def use_vectorized(n):
+    """Whether NumPy scoring is available and worth it for n queens."""
+    return np is not None and n > VECTORIZE_ABOVE
+
+def run(steps):
+    """Drain a step generator silently: (last Step, the generator's return value)."""
+    last = None
+    while True:
+        try:
+            last = next(steps)
+        except StopIteration as stop:
+            return last, stop.value
+
+def trace(steps, show, every=1, interval=0.0):
+    """Drain a step generator, calling show(event) on a sample of its events.
+
+    Only every `every`-th step is shown, and none sooner than `interval`
+    seconds after the previous one; the first and last events are always
+    shown. Returns the same as run().
+    """
+    last, shown, next_time = None, None, 0.0
+    while True:
+        try:
+            event = next(steps)
+        except StopIteration as stop:
+            if last is not None and shown is not last:
+                show(last)
+            return last, stop.value
+        last = event
+        if shown is None or (event.step % every == 0 and time.perf_counter() >= next_time):
+            show(event)
+            shown = event
+            next_time = time.perf_counter() + interval
+
+class QueensBoard:
+    """N-Queens state shared by the week 5 optimizers.
+
+    state[col] is the row of the queen in column col. Queen counts per row,
+    diagonal (row - col) and anti-diagonal (row + col) are kept alongside, so
+    the change in attacking pairs for moving one queen costs O(1) to evaluate
+    and to apply.
+    """
+
+    def __init__(self, state):
+        self.state = list(state)
+        n = self.n = len(self.state)
+        self.rows = [0] * n
+        self.diags = [0] * (2 * n - 1)
+        self.antis = [0] * (2 * n - 1)
+        for col, row in enumerate(self.state):
+            self._count(col, row, 1)
+        self.attacks = sum(c * (c - 1) // 2 for line in (self.rows, self.diags, self.antis)
+                           for c in line)
+
+    def __len__(self):
+        return self.n
+
+    def _count(self, col, row, step):
+        self.rows[row] += step
+        self.diags[row - col + self.n - 1] += step
+        self.antis[row + col] += step
+
+    def copy(self):
+        board = QueensBoard.__new__(QueensBoard)
+        board.state, board.n, board.attacks = list(self.state), self.n, self.attacks
+        board.rows, board.diags, board.antis = list(self.rows), list(self.diags), list(self.antis)
+        return board
+
+    def conflicts(self, col, row):
+        """Queens outside column col that attack square (col, row)."""
+        count = self.rows[row] + self.diags[row - col + self.n - 1] + self.antis[row + col]
+        if self.state[col] == row:
+            count -= 3
+        return count
+
+    def delta(self, col, row):
+        """Change in attacking pairs if the queen in column col moves to row."""
+        return self.conflicts(col, row) - self.conflicts(col, self.state[col])
+
+    def move(self, col, row):
+        old = self.state[col]
+        if old == row:
+            return
+        self.attacks += self.delta(col, row)
+        self._count(col, old, -1)
+        self._count(col, row, 1)
+        self.state[col] = row
+
+    def best_move(self):
+        """Steepest-ascent move as (delta, col, row), first in column-major order on ties.
+
+        Scans all n * (n - 1) moves in Python; for large boards use
+        best_move_vectorized() (see use_vectorized()).
+        """
+        n, state = self.n, self.state
+        rows, diags, antis = self.rows, self.diags, self.antis
+        best = None
+        for col in range(n):
+            old = state[col]
+            here = rows[old] + diags[old - col + n - 1] + antis[old + col] - 3
+            for row in range(n):
+                if row != old:
+                    d = rows[row] + diags[row - col + n - 1] + antis[row + col] - here
+                    if best is None or d < best[0]:
+                        best = (d, col, row)
+        return best
+
+    def best_move_vectorized(self, block=1 << 22):
+        """best_move() computed with NumPy, without building any neighbour objects.
+
+        The n x n move-cost matrix (column by row) is filled from the line
+        counts with fancy indexing, in blocks of columns of about `block`
+        entries, and the best move is taken with argmin.
+        """
+        if np is None:
+            raise ImportError("best_move_vectorized() needs NumPy")
+        n = self.n
+        if n < 2:
+            return None
+        rows = np.asarray(self.rows, dtype=np.int64)
+        diags = np.asarray(self.diags, dtype=np.int64)
+        antis = np.asarray(self.antis, dtype=np.int64)
+        state = np.asarray(self.state, dtype=np.int64)
+        r = np.arange(n)
+        step = max(1, block // n)
+        best = None
+        for first in range(0, n, step):
+            cols = r[first:first + step, None]
+            cost = rows[None, :] + diags[r - cols + n - 1] + antis[r + cols]
+            k = np.arange(len(cols))
+            current = state[first:first + len(cols)]
+            cost -= (cost[k, current] - 3)[:, None]
+            cost[k, current] = 3 * n  # staying put is not a move
+            i = int(cost.argmin())
+            d = int(cost.flat[i])
+            if best is None or d < best[0]:
+                best = (d, first + i // n, i % n)
+        return best
+
+    def best_moves(self):
+        """(delta, [(col, row), ...]) for every move tied for the steepest descent."""
+        n, state = self.n, self.state
+        rows, diags, antis = self.rows, self.diags, self.antis
+        best, moves = None, []
+        for col in range(n):
+            old = state[col]
+            here = rows[old] + diags[old - col + n - 1] + antis[old + col] - 3
+            for row in range(n):
+                if row != old:
+                    d = rows[row] + diags[row - col + n - 1] + antis[row + col] - here
+                    if best is None or d < best:
+                        best, moves = d, [(col, row)]
+                    elif d == best:
+                        moves.append((col, row))
+        return best, moves
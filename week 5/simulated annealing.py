@@ -1,15 +1,11 @@
 import random
 import math
 
+from queens import QueensBoard
+
 def calculate_attacks(state):
-    """Heuristic: number of attacking queen pairs."""
-    attacks = 0
-    n = len(state)
-    for i in range(n):
-        for j in range(i + 1, n):
-            if state[i] == state[j] or abs(state[i] - state[j]) == abs(i - j):
-                attacks += 1
-    return attacks
+    """Heuristic: number of attacking queen pairs (O(n) via line counts)."""
+    return QueensBoard(state).attacks
 
 def random_neighbor(state):
     """Generate a random neighbor by moving one queen."""
@@ -22,30 +18,129 @@ def random_neighbor(state):
     neighbor[col] = row
     return neighbor
 
-def simulated_annealing(n, max_steps=10000, initial_temp=100, cooling_rate=0.99):
-    """Solve N-Queens using simulated annealing."""
-    current = [random.randint(0, n - 1) for _ in range(n)]
-    current_attacks = calculate_attacks(current)
+# ------------------- COOLING SCHEDULES -------------------
+# Each factory takes (initial_temp, max_steps, **params) and returns
+# update(temp, start_temp, t, accepted) -> next temperature, where t counts
+# steps since the last (re)heating to start_temp and accepted tells whether
+# the last move was taken.
+
+def geometric(initial_temp, max_steps, rate=None, final_ratio=1e-4):
+    """T *= rate; by default rate reaches final_ratio * T0 at max_steps."""
+    if rate is None:
+        rate = final_ratio ** (1 / max_steps)
+    return lambda temp, start_temp, t, accepted: temp * rate
+
+def linear(initial_temp, max_steps):
+    """T falls in a straight line from T0 to 0 over max_steps."""
+    return lambda temp, start_temp, t, accepted: start_temp * max(0.0, 1 - t / max_steps)
+
+def logarithmic(initial_temp, max_steps):
+    """T = T0 / ln(e + t): very slow, the classic convergence-guarantee schedule."""
+    return lambda temp, start_temp, t, accepted: start_temp / math.log(math.e + t)
+
+def lundy_mees(initial_temp, max_steps, beta=None, final_ratio=1e-4):
+    """T = T / (1 + beta * T); by default beta reaches final_ratio * T0 at max_steps."""
+    if beta is None:
+        beta = (1 / (final_ratio * initial_temp) - 1 / initial_temp) / max_steps
+    return lambda temp, start_temp, t, accepted: temp / (1 + beta * temp)
+
+def adaptive(initial_temp, max_steps, target=0.02, window=100, factor=0.9):
+    """Every `window` steps, cool by `factor` if more than `target` of the
+    moves were accepted and warm by it otherwise."""
+    counts = [0, 0]
+    def update(temp, start_temp, t, accepted):
+        counts[0] += accepted
+        counts[1] += 1
+        if counts[1] < window:
+            return temp
+        rate = counts[0] / counts[1]
+        counts[0] = counts[1] = 0
+        return temp * factor if rate > target else temp / factor
+    return update
+
+SCHEDULES = {
+    "geometric": geometric,
+    "linear": linear,
+    "logarithmic": logarithmic,
+    "lundy_mees": lundy_mees,
+    "adaptive": adaptive,
+}
 
-    temperature = initial_temp
+def make_schedule(name, initial_temp, max_steps, **params):
+    if name not in SCHEDULES:
+        raise ValueError(f"Unknown schedule {name!r}; choose from {', '.join(SCHEDULES)}")
+    return SCHEDULES[name](initial_temp, max_steps, **params)
+
+def simulated_annealing(n, max_steps=10000, initial_temp=100, cooling_rate=None,
+                        schedule="geometric", reheat_after=None, reheat_temp=None,
+                        min_temp=1e-6, **schedule_params):
+    """Solve N-Queens using simulated annealing.
+
+    schedule names a SCHEDULES entry (extra keyword arguments go to it); the
+    default geometric schedule cools by cooling_rate, which by default is
+    derived from max_steps so the temperature reaches 1e-4 * initial_temp on
+    the last step instead of freezing early. The run stops once the
+    temperature drops below min_temp, unless reheat_after is set: then the
+    temperature goes back to reheat_temp (default initial_temp) whenever
+    reheat_after steps pass without a new best board, or it gets too cold.
+    Returns the best board seen and its attacking pairs.
+    """
+    if schedule == "geometric":
+        schedule_params.setdefault("rate", cooling_rate)
+    update = make_schedule(schedule, initial_temp, max_steps, **schedule_params)
+    if reheat_temp is None:
+        reheat_temp = initial_temp
+
+    # Moves are scored and applied in O(1) on the board's line counts
+    board = QueensBoard(random.randint(0, n - 1) for _ in range(n))
+    current = board.state
+
+    # Best-so-far without copying the board on every improvement: undo logs
+    # (col, old row) for each move since the best board, and the board is
+    # only copied into best once the log outgrows it
+    best, undo, best_attacks, best_step = None, [], board.attacks, 0
+
+    temperature = start_temp = initial_temp
+    start_step = 0
 
     for step in range(max_steps):
-        if current_attacks == 0:
-            return current, current_attacks 
+        if board.attacks == 0:
+            return current, board.attacks
 
-        neighbor = random_neighbor(current)
-        neighbor_attacks = calculate_attacks(neighbor)
+        # Same draw as random_neighbor(), without copying the state
+        col = random.randint(0, n - 1)
+        row = random.randint(0, n - 1)
+        while row == current[col]:
+            row = random.randint(0, n - 1)
 
-        delta_e = current_attacks - neighbor_attacks
+        delta_e = -board.delta(col, row)
 
-        if delta_e > 0 or random.random() < math.exp(delta_e / temperature):
-            current, current_attacks = neighbor, neighbor_attacks
+        accepted = delta_e > 0 or random.random() < math.exp(delta_e / temperature)
+        if accepted:
+            if undo is not None:
+                undo.append((col, current[col]))
+            board.move(col, row)
+            if board.attacks < best_attacks:
+                best, undo, best_attacks, best_step = None, [], board.attacks, step
+            elif undo is not None and len(undo) > n:
+                best, undo = _rewind(current, undo), None
 
-        temperature *= cooling_rate
-        if temperature < 1e-6:
+        temperature = update(temperature, start_temp, step + 1 - start_step, accepted)
+        if reheat_after is not None and (step - best_step >= reheat_after or temperature < min_temp):
+            temperature = start_temp = reheat_temp
+            start_step, best_step = step + 1, step
+        elif temperature < min_temp:
             break
 
-    return current, current_attacks
+    if best is None:
+        best = _rewind(current, undo)
+    return best, best_attacks
+
+def _rewind(state, undo):
+    board = list(state)
+    for col, row in reversed(undo):
+        board[col] = row
+    return board
 
 if __name__ == "__main__":
     N = 8
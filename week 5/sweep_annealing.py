@@ -0,0 +1,81 @@
+# Parameter sweep for the simulated annealing cooling schedules.
+#
+# Every (schedule, board size, seed) run is a separate job on a process pool.
+# Runs get steps_per_queen * n steps and start at --temp; --reheat N reheats
+# after N steps without a new best board. Reports the success rate and
+# solutions per CPU-second for each schedule and size.
+#
+#   python sweep_annealing.py --sizes 8,16,32,64 --runs 20 --schedules geometric,lundy_mees
+
+import argparse
+import importlib.util
+import os
+import random
+import time
+from collections import defaultdict
+from functools import partial
+from multiprocessing import Pool
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+_annealing = None
+
+def get_annealing():
+    # The script has a space in its name, so load it by path; each worker
+    # process does this once
+    global _annealing
+    if _annealing is None:
+        spec = importlib.util.spec_from_file_location(
+            "_sweep_annealing", os.path.join(HERE, "simulated annealing.py"))
+        _annealing = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_annealing)
+    return _annealing
+
+def run_job(job, steps_per_queen=1000, initial_temp=1.0, reheat_after=None):
+    schedule, n, seed = job
+    params = {"rate": None} if schedule == "geometric" else {}  # rate from max_steps
+    random.seed(seed)
+    t0 = time.process_time()  # CPU time of this worker, not wall time
+    _, attacks = get_annealing().simulated_annealing(
+        n, max_steps=steps_per_queen * n, initial_temp=initial_temp, schedule=schedule,
+        reheat_after=reheat_after, **params)
+    return schedule, n, attacks == 0, time.process_time() - t0
+
+def sweep(schedules, sizes, runs, workers=None, seed=0, **options):
+    """{(schedule, n): (solved, runs, cpu seconds)} over all runs."""
+    jobs = [(name, n, seed + i) for name in schedules for n in sizes for i in range(runs)]
+    totals = defaultdict(lambda: [0, 0, 0.0])
+    with Pool(workers) as pool:
+        for schedule, n, solved, seconds in pool.imap_unordered(partial(run_job, **options), jobs):
+            total = totals[schedule, n]
+            total[0] += solved
+            total[1] += 1
+            total[2] += seconds
+    return {key: tuple(value) for key, value in totals.items()}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep simulated annealing schedules.")
+    parser.add_argument("--schedules", default=",".join(get_annealing().SCHEDULES))
+    parser.add_argument("--sizes", default="8,16,32,64")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--steps", type=int, default=1000, help="steps per queen")
+    parser.add_argument("--temp", type=float, default=1.0, help="initial temperature")
+    parser.add_argument("--reheat", type=int, default=None,
+                        help="reheat after this many steps without a new best")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    schedules = args.schedules.split(",")
+    sizes = [int(x) for x in args.sizes.split(",")]
+    for name in schedules:
+        get_annealing().make_schedule(name, args.temp, 1)  # fail fast on a bad name
+
+    results = sweep(schedules, sizes, args.runs, args.workers, args.seed,
+                    steps_per_queen=args.steps, initial_temp=args.temp,
+                    reheat_after=args.reheat)
+    print(f"{'schedule':<14}{'n':>6}{'solved':>10}{'cpu s':>10}{'solved/s':>10}")
+    for name in schedules:
+        for n in sizes:
+            solved, count, seconds = results[name, n]
+            print(f"{name:<14}{n:>6}{f'{solved}/{count}':>10}{seconds:>10.2f}"
+                  f"{solved / seconds if seconds else 0:>10.2f}")
@@ -0,0 +1,76 @@
+# Bit-parallel truth tables: every model at once, as bits of Python ints.
+#
+# Models are numbered in itertools.product([False, True], repeat=n) order,
+# so the first symbol is the most significant bit of the model index. A
+# symbol becomes the int whose bit k is its value in model k, and each
+# connective is one bitwise operation over all models. Above CHUNK_BITS
+# symbols the table is cut into 2**CHUNK_BITS-model chunks: the leading
+# symbols are fixed per chunk (their columns are all ones or all zeros), so
+# memory stays bounded however many symbols there are.
+
+from logic import as_ast, operands, symbols_of
+
+CHUNK_BITS = 20
+
+def column(i, width):
+    """Bits over 2**width models where symbol i (0 = most significant) is true."""
+    block = 1 << (width - 1 - i)
+    bits, period = ((1 << block) - 1) << block, 2 * block
+    while period < 1 << width:  # double the pattern until it covers every model
+        bits |= bits << period
+        period *= 2
+    return bits
+
+def evaluate_bits(formula, columns, mask):
+    """Truth column of a formula given {symbol: column}; mask has a bit per model."""
+    node = as_ast(formula)
+    kind = node[0]
+    if kind == "sym":
+        return columns[node[1]]
+    if kind == "const":
+        return mask if node[1] else 0
+    if kind == "not":
+        return mask ^ evaluate_bits(node[1], columns, mask)
+    if kind == "and":
+        bits = mask
+        for n in operands(node):
+            bits &= evaluate_bits(n, columns, mask)
+        return bits
+    if kind == "or":
+        bits = 0
+        for n in operands(node):
+            bits |= evaluate_bits(n, columns, mask)
+        return bits
+    a, b = evaluate_bits(node[1], columns, mask), evaluate_bits(node[2], columns, mask)
+    if kind == "implies":
+        return (mask ^ a) | b
+    return mask ^ (a ^ b)
+
+def chunks(formulas, symbols, chunk_bits=CHUNK_BITS, start=0, stop=None):
+    """Yield (first model index, model count, [column per formula]) per chunk.
+
+    Only chunks overlapping models start..stop-1 are evaluated.
+    """
+    symbols = list(symbols)
+    asts = [as_ast(f) for f in formulas]
+    missing = [s for f in asts for s in symbols_of(f) if s not in symbols]
+    if missing:
+        raise ValueError(f"Symbols {sorted(set(missing))} are not in {symbols}")
+    width = min(len(symbols), chunk_bits)
+    fixed = len(symbols) - width
+    size = 1 << width
+    mask = (1 << size) - 1
+    low = {s: column(i, width) for i, s in enumerate(symbols[fixed:])}
+    stop = 1 << len(symbols) if stop is None else min(stop, 1 << len(symbols))
+    for chunk in range(start >> width, (stop + size - 1) >> width):
+        columns = dict(low)
+        for i, s in enumerate(symbols[:fixed]):
+            columns[s] = mask if (chunk >> (fixed - 1 - i)) & 1 else 0
+        yield chunk * size, size, [evaluate_bits(f, columns, mask) for f in asts]
+
+def bit_entails(KB, alpha, symbols, chunk_bits=CHUNK_BITS):
+    """KB |= alpha iff no model has KB true and alpha false: (KB & ~alpha) == 0."""
+    for _, _, (kb, a) in chunks((KB, alpha), symbols, chunk_bits):
+        if kb & ~a:
+            return False
+    return True
@@ -0,0 +1,66 @@
+# Tseitin encoding of propositional formulas into CNF.
+#
+# Each compound subformula gets a fresh variable constrained to equal it, so
+# the CNF grows linearly with the formula instead of exponentially and is
+# satisfiable exactly when the formula is. Literals are DIMACS-style ints:
+# variable v is v, its negation -v. Identical subformulas share a variable.
+
+from logic import as_ast, operands
+
+class CNF:
+    def __init__(self):
+        self.var_of = {}     # symbol name -> variable
+        self.clauses = []
+        self.num_vars = 0
+        self._cache = {}     # subformula -> literal
+        self._true = None
+
+    def new_var(self):
+        self.num_vars += 1
+        return self.num_vars
+
+    def var(self, name):
+        if name not in self.var_of:
+            self.var_of[name] = self.new_var()
+        return self.var_of[name]
+
+    def literal(self, formula):
+        """Literal equivalent to the formula, adding its defining clauses."""
+        node = as_ast(formula)
+        kind = node[0]
+        if kind == "sym":
+            return self.var(node[1])
+        if kind == "not":
+            return -self.literal(node[1])
+        if node in self._cache:
+            return self._cache[node]
+        if kind == "const":
+            if self._true is None:
+                self._true = self.new_var()
+                self.clauses.append([self._true])
+            lit = self._true if node[1] else -self._true
+        elif kind in ("and", "or"):
+            lits = [self.literal(n) for n in operands(node)]
+            lit = self.new_var()
+            sign = 1 if kind == "and" else -1
+            # and: v -> each l, all l -> v;  or is the same with signs flipped
+            for l in lits:
+                self.clauses.append([-sign * lit, sign * l])
+            self.clauses.append([sign * lit] + [-sign * l for l in lits])
+        elif kind == "implies":
+            lit = self.literal(("or", ("not", node[1]), node[2]))
+        else:
+            a, b = self.literal(node[1]), self.literal(node[2])
+            lit = self.new_var()
+            self.clauses += [[-lit, -a, b], [-lit, a, -b], [lit, a, b], [lit, -a, -b]]
+        self._cache[node] = lit
+        return lit
+
+    def add(self, formula):
+        """Assert the formula; top-level conjuncts become separate assertions."""
+        node = as_ast(formula)
+        if node[0] == "and":
+            for n in operands(node):
+                self.add(n)
+        else:
+            self.clauses.append([self.literal(node)])
@@ -0,0 +1,213 @@
+# Propositional formulas, parsed once and compiled to Python functions.
+#
+# Syntax (loosest binding first):  a <=> b   a => b   a | b   a & b   ~a
+# "<->", "->", "or", "and", "not" and "!" are accepted as spellings, along
+# with parentheses and the constants True / False. Symbols are identifiers.
+#
+# An AST node is a tuple: ("sym", name), ("const", bool), ("not", x), or
+# (op, left, right) with op in "and", "or", "implies", "iff".
+
+import re
+from functools import lru_cache
+
+_TOKEN = re.compile(r"\s*(?:(<=>|<->|=>|->|[~!&|()])|([A-Za-z_][A-Za-z0-9_]*))")
+_SPELLING = {"<->": "<=>", "->": "=>", "!": "~", "not": "~", "and": "&", "or": "|"}
+_BINARY = {"<=>": "iff", "=>": "implies", "|": "or", "&": "and"}
+
+def tokenize(text):
+    tokens, pos = [], 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if m is None:
+            pos = len(text) - len(text[pos:].lstrip())
+            raise ValueError(f"Unexpected character {text[pos]!r} at {pos} in {text!r}")
+        op, name = m.groups()
+        if name is not None and name not in _SPELLING:
+            tokens.append(("const", name == "True") if name in ("True", "False") else ("sym", name))
+        else:
+            tokens.append(("op", _SPELLING.get(op or name, op or name)))
+        pos = m.end()
+    return tokens
+
+class _Parser:
+    # Recursive descent over the precedence levels; => is right-associative,
+    # the others group left like Python's and / or
+    LEVELS = ("<=>", "=>", "|", "&")
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.i = 0
+
+    def peek(self):
+        return self.tokens[self.i] if self.i < len(self.tokens) else None
+
+    def take(self, op):
+        if self.peek() == ("op", op):
+            self.i += 1
+            return True
+        return False
+
+    def error(self, what):
+        tok = self.peek()
+        found = "end of input" if tok is None else repr(tok[1])
+        return ValueError(f"Expected {what}, found {found} in {self.text!r}")
+
+    def parse(self):
+        node = self.binary(0)
+        if self.peek() is not None:
+            raise self.error("an operator")
+        return node
+
+    def binary(self, level):
+        if level == len(self.LEVELS):
+            return self.unary()
+        op = self.LEVELS[level]
+        node = self.binary(level + 1)
+        if op == "=>":
+            if self.take(op):
+                node = ("implies", node, self.binary(level))
+            return node
+        while self.take(op):
+            node = (_BINARY[op], node, self.binary(level + 1))
+        return node
+
+    def unary(self):
+        if self.take("~"):
+            return ("not", self.unary())
+        if self.take("("):
+            node = self.binary(0)
+            if not self.take(")"):
+                raise self.error("')'")
+            return node
+        tok = self.peek()
+        if tok is None or tok[0] == "op":
+            raise self.error("a symbol")
+        self.i += 1
+        return tok
+
+@lru_cache(maxsize=None)
+def parse(text):
+    """AST for a formula string (cached, so each formula is parsed once)."""
+    return _Parser(text).parse()
+
+def as_ast(formula):
+    return parse(formula) if isinstance(formula, str) else formula
+
+def symbols_of(formula):
+    """Symbol names in order of first appearance."""
+    seen = {}
+    stack = [as_ast(formula)]
+    while stack:
+        node = stack.pop()
+        if node[0] == "sym":
+            seen.setdefault(node[1], None)
+        elif node[0] != "const":
+            stack.extend(reversed(node[1:]))
+    return list(seen)
+
+def evaluate(formula, model):
+    """Tree-walking evaluation against a {symbol: bool} model."""
+    node = as_ast(formula)
+    kind = node[0]
+    if kind == "sym":
+        return model[node[1]]
+    if kind == "const":
+        return node[1]
+    if kind == "not":
+        return not evaluate(node[1], model)
+    left = evaluate(node[1], model)
+    if kind == "and":
+        return left and evaluate(node[2], model)
+    if kind == "or":
+        return left or evaluate(node[2], model)
+    if kind == "implies":
+        return not left or evaluate(node[2], model)
+    return left == evaluate(node[2], model)
+
+def partial_evaluate(formula, model):
+    """Three-valued (Kleene) evaluation: True, False, or None when the value
+    still depends on symbols missing from the model."""
+    node = as_ast(formula)
+    kind = node[0]
+    if kind == "sym":
+        return model.get(node[1])
+    if kind == "const":
+        return node[1]
+    if kind == "not":
+        value = partial_evaluate(node[1], model)
+        return None if value is None else not value
+    if kind in ("and", "or"):
+        # One False decides an and, one True an or; otherwise unknown wins
+        decisive = kind == "or"
+        result = not decisive
+        for n in operands(node):
+            value = partial_evaluate(n, model)
+            if value is decisive:
+                return decisive
+            if value is None:
+                result = None
+        return result
+    left = partial_evaluate(node[1], model)
+    if kind == "implies":
+        if left is False:
+            return True
+        right = partial_evaluate(node[2], model)
+        return True if right is True else None if left is None or right is None else False
+    right = partial_evaluate(node[2], model)
+    return None if left is None or right is None else left == right
+
+def operands(node):
+    # Flatten a chain of the same and / or so long conjunctions compile flat
+    # instead of hitting the compiler's nesting limit
+    kind, out, stack = node[0], [], [node]
+    while stack:
+        n = stack.pop()
+        if n[0] == kind:
+            stack.append(n[2])
+            stack.append(n[1])
+        else:
+            out.append(n)
+    return out
+
+def _source(node, leaf):
+    kind = node[0]
+    if kind == "sym":
+        return leaf(node[1])
+    if kind == "const":
+        return repr(node[1])
+    if kind == "not":
+        return f"(not {_source(node[1], leaf)})"
+    if kind in ("and", "or"):
+        return "(" + f" {kind} ".join(_source(n, leaf) for n in operands(node)) + ")"
+    a, b = _source(node[1], leaf), _source(node[2], leaf)
+    if kind == "implies":
+        return f"((not {a}) or {b})"
+    return f"((not {a}) == (not {b}))"
+
+@lru_cache(maxsize=None)
+def _compile(node, symbols):
+    if symbols is None:
+        leaf, arg = (lambda name: f"m[{name!r}]"), "m"
+    else:
+        index = {name: i for i, name in enumerate(symbols)}
+        missing = [name for name in symbols_of(node) if name not in index]
+        if missing:
+            raise ValueError(f"Symbols {missing} are not in {list(symbols)}")
+        leaf, arg = (lambda name: f"v[{index[name]}]"), "v"
+    try:
+        return eval(compile(f"lambda {arg}: bool({_source(node, leaf)})", "<formula>", "eval"))
+    except (RecursionError, SyntaxError, MemoryError):
+        # Too deeply nested for the compiler: walk the tree instead
+        if symbols is None:
+            return lambda m: evaluate(node, m)
+        return lambda v: evaluate(node, dict(zip(symbols, v)))
+
+def compile_formula(formula, symbols=None):
+    """Compile a formula (string or AST) to a Python function, once per formula.
+
+    With symbols, the function takes a sequence of booleans in that order;
+    without, it takes a {symbol: bool} model dict.
+    """
+    return _compile(as_ast(formula), None if symbols is None else tuple(symbols))
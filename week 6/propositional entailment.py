@@ -1,44 +1,127 @@
-import itertools
+from collections import namedtuple
+
+from bitparallel import bit_entails
+from logic import as_ast, compile_formula, partial_evaluate, symbols_of
+from sat import sat_entails, satisfiable
+from truth_table import rows
+
+# Past this many symbols a truth table (even bit-parallel) is slower than
+# asking the CDCL solver whether KB & ~alpha is satisfiable
+SAT_THRESHOLD = 24
 
 def eval_expr(expr: str, model: dict) -> bool:
-    e = expr
-    for sym, val in model.items():
-        e = e.replace(sym, str(val))
-    e = e.replace("&", " and ")
-    e = e.replace("|", " or ")
-    e = e.replace("~", " not ")
-    return eval(e)
+    # Parsed and compiled once per formula (see logic.py), then run per model
+    return compile_formula(expr)(model)
 
 def pl_true(expr: str, model: dict) -> bool:
     return eval_expr(expr, model)
 
+# Models of KB over all symbols, how many of them make alpha true, and how
+# many make it false (KB |= alpha iff counterexamples == 0)
+Counts = namedtuple("Counts", "models entailed counterexamples")
+
+def pl_partial(expr: str, model: dict):
+    # True / False once the partial model decides expr, None while it doesn't
+    return partial_evaluate(expr, model)
+
+def check_symbols(KB: str, alpha: str, symbols: list):
+    # The pruned recursions only branch on listed symbols, so an unlisted one
+    # would leave the formulas undecided with nothing left to assign
+    missing = [s for f in (KB, alpha) for s in symbols_of(f) if s not in symbols]
+    if missing:
+        raise ValueError(f"Symbols {sorted(set(missing))} are not in {list(symbols)}")
+
 def tt_check_all(KB: str, alpha: str, symbols: list, model: dict) -> bool:
-    if not symbols:
-        if pl_true(KB, model):
-            return pl_true(alpha, model)
-        else:
-            return True
+    check_symbols(KB, alpha, list(symbols) + list(model))
+    return _check_all(KB, alpha, symbols, model)
+
+def _check_all(KB, alpha, symbols, model):
+    # Stop as soon as the partial model decides the answer for the whole
+    # subtree: KB already false or alpha already true holds for every
+    # completion, KB true with alpha false fails for every completion
+    kb = pl_partial(KB, model)
+    if kb is False:
+        return True
+    a = pl_partial(alpha, model)
+    if a is True:
+        return True
+    if kb is True and a is False:
+        return False
     P, rest = symbols[0], symbols[1:]
     model_true = model.copy()
     model_true[P] = True
     model_false = model.copy()
     model_false[P] = False
-    return (tt_check_all(KB, alpha, rest, model_true) and
-            tt_check_all(KB, alpha, rest, model_false))
+    return (_check_all(KB, alpha, rest, model_true) and
+            _check_all(KB, alpha, rest, model_false))
+
+def tt_counterexample(KB: str, alpha: str, symbols: list, model: dict = None):
+    """First model (in truth-table order) with KB true and alpha false, or
+    None if KB entails alpha. Above SAT_THRESHOLD symbols it is whichever
+    counterexample the SAT solver finds."""
+    model = {} if model is None else model
+    check_symbols(KB, alpha, list(symbols) + list(model))
+    if len(symbols) > SAT_THRESHOLD:
+        fixed = [("sym", P) if v else ("not", ("sym", P)) for P, v in model.items()]
+        found = satisfiable([KB, ("not", as_ast(alpha))] + fixed)
+        if found is None:
+            return None
+        return {**model, **{P: found.get(P, False) for P in symbols if P not in model}}
+    return _counterexample(KB, alpha, symbols, model)
+
+def _counterexample(KB, alpha, symbols, model):
+    kb = pl_partial(KB, model)
+    if kb is False:
+        return None
+    a = pl_partial(alpha, model)
+    if a is True:
+        return None
+    if kb is True and a is False:
+        # Any completion is a counterexample; pick the first in table order
+        return {**model, **{P: False for P in symbols}}
+    P, rest = symbols[0], symbols[1:]
+    for value in (False, True):
+        found = _counterexample(KB, alpha, rest, {**model, P: value})
+        if found is not None:
+            return found
+    return None
+
+def tt_count(KB: str, alpha: str, symbols: list, model: dict = None) -> Counts:
+    """Count KB's models and split them by alpha, skipping every subtree the
+    partial model already decides instead of enumerating its 2**k rows."""
+    model = {} if model is None else model
+    check_symbols(KB, alpha, list(symbols) + list(model))
+    return _count(KB, alpha, symbols, model)
+
+def _count(KB, alpha, symbols, model):
+    kb = pl_partial(KB, model)
+    if kb is False:
+        return Counts(0, 0, 0)
+    a = pl_partial(alpha, model)
+    if kb is True and a is not None:
+        total = 1 << len(symbols)
+        return Counts(total, total, 0) if a else Counts(total, 0, total)
+    P, rest = symbols[0], symbols[1:]
+    low = _count(KB, alpha, rest, {**model, P: False})
+    high = _count(KB, alpha, rest, {**model, P: True})
+    return Counts(*(x + y for x, y in zip(low, high)))
 
 def tt_entails(KB: str, alpha: str, symbols: list) -> bool:
-    return tt_check_all(KB, alpha, symbols, {})
+    # Same truth-table check as tt_check_all, over all models at once as
+    # bitsets (chunked past bitparallel.CHUNK_BITS symbols); large symbol
+    # sets go to the SAT solver instead
+    if len(symbols) > SAT_THRESHOLD:
+        return sat_entails(KB, alpha, symbols)
+    return bit_entails(KB, alpha, symbols)
 
-def print_truth_table(KB: str, alpha: str, symbols: list):
+def print_truth_table(KB: str, alpha: str, symbols: list, **options):
+    # options go to truth_table.rows: where=, start=, stop= to filter or page
     print("Truth Table:")
     header = symbols + [KB, alpha]
     print(" | ".join(f"{h:^5}" for h in header))
     print("-" * (7 * len(header)))
 
-    for values in itertools.product([False, True], repeat=len(symbols)):
-        model = {sym: val for sym, val in zip(symbols, values)}
-        kb_val = pl_true(KB, model)
-        alpha_val = pl_true(alpha, model)
+    for _, values, kb_val, alpha_val in rows(KB, alpha, symbols, **options):
         row = list(values) + [kb_val, alpha_val]
         print(" | ".join(f"{str(x):^5}" for x in row))
 
@@ -50,3 +133,9 @@ if __name__ == "__main__":
     print_truth_table(KB, alpha, symbols)
     result = tt_entails(KB, alpha, symbols)
     print("\nKB entails alpha?", "YES" if result else "NO")
+    counts = tt_count(KB, alpha, symbols)
+    print(f"KB models: {counts.models}, alpha true in {counts.entailed}, "
+          f"counterexamples: {counts.counterexamples}")
+    counterexample = tt_counterexample(KB, alpha, symbols)
+    if counterexample is not None:
+        print("First counterexample:", counterexample)
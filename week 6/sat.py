@@ -0,0 +1,223 @@
+# CDCL SAT solver and SAT-based entailment.
+#
+# Conflict-driven clause learning in the MiniSat mould: two watched literals
+# per clause for unit propagation, first-UIP conflict analysis with
+# non-chronological backjumping, VSIDS branching (bump the variables in each
+# conflict, decay everyone else) with phase saving, and geometric restarts.
+# KB |= alpha is decided as "KB & ~alpha is unsatisfiable" on its Tseitin CNF,
+# which is not exponential in the number of symbols the way truth tables are.
+
+import heapq
+
+from cnf import CNF
+from logic import as_ast, symbols_of
+
+class Solver:
+    def __init__(self, num_vars, clauses):
+        self.num_vars = num_vars
+        self.value = [0] * (num_vars + 1)   # 1 true, -1 false, 0 unassigned
+        self.level = [0] * (num_vars + 1)
+        self.reason = [None] * (num_vars + 1)
+        self.phase = [-1] * (num_vars + 1)  # saved polarity, false first
+        self.activity = [0.0] * (num_vars + 1)
+        self.var_inc = 1.0
+        self.order = [(0.0, v) for v in range(1, num_vars + 1)]
+        self.trail, self.trail_lim = [], []
+        self.qhead = 0
+        self.clauses = []
+        self.watches = {}   # literal -> clauses watching it (it is c[0] or c[1])
+        self.ok = True
+        self.conflicts = 0
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def lit_value(self, lit):
+        v = self.value[abs(lit)]
+        return v if lit > 0 else -v
+
+    def add_clause(self, clause):
+        clause = list(dict.fromkeys(clause))
+        if not self.ok or any(-l in clause for l in clause):
+            return  # already unsatisfiable, or a tautology
+        clause = [l for l in clause if self.lit_value(l) >= 0 or self.level[abs(l)] > 0]
+        if any(self.lit_value(l) > 0 and self.level[abs(l)] == 0 for l in clause):
+            return
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            if self.lit_value(clause[0]) < 0:
+                self.ok = False
+            elif self.lit_value(clause[0]) == 0:
+                self.enqueue(clause[0], None)
+                self.ok = self.propagate() is None
+        else:
+            self.clauses.append(clause)
+            self.watch(clause)
+
+    def watch(self, clause):
+        self.watches.setdefault(clause[0], []).append(clause)
+        self.watches.setdefault(clause[1], []).append(clause)
+
+    def enqueue(self, lit, reason):
+        v = abs(lit)
+        self.value[v] = 1 if lit > 0 else -1
+        self.level[v] = len(self.trail_lim)
+        self.reason[v] = reason
+        self.trail.append(lit)
+
+    def propagate(self):
+        # Returns a conflicting clause, or None once everything is propagated
+        value, watches = self.value, self.watches
+        while self.qhead < len(self.trail):
+            false_lit = -self.trail[self.qhead]
+            self.qhead += 1
+            watching = watches.get(false_lit)
+            if not watching:
+                continue
+            kept = []
+            i = 0
+            while i < len(watching):
+                clause = watching[i]
+                i += 1
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], clause[0]
+                first = clause[0]
+                fv = value[abs(first)]
+                if (fv if first > 0 else -fv) > 0:
+                    kept.append(clause)
+                    continue
+                for k in range(2, len(clause)):
+                    lit = clause[k]
+                    lv = value[abs(lit)]
+                    if (lv if lit > 0 else -lv) >= 0:
+                        clause[1], clause[k] = lit, false_lit
+                        watches.setdefault(lit, []).append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if (fv if first > 0 else -fv) < 0:
+                        kept.extend(watching[i:])
+                        watches[false_lit] = kept
+                        return clause
+                    self.enqueue(first, clause)
+            watches[false_lit] = kept
+        return None
+
+    def bump(self, v):
+        self.activity[v] += self.var_inc
+        if self.activity[v] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self.order = [(-self.activity[u], u) for u in range(1, self.num_vars + 1)
+                          if self.value[u] == 0]
+            heapq.heapify(self.order)
+        elif self.value[v] == 0:
+            heapq.heappush(self.order, (-self.activity[v], v))
+
+    def analyze(self, conflict):
+        # First-UIP learnt clause (asserting literal first) and backjump level
+        seen = set()
+        learnt = [None]
+        pending = 0
+        lit = None
+        index = len(self.trail) - 1
+        current = len(self.trail_lim)
+        clause = conflict
+        while True:
+            for q in clause:
+                if q == lit:
+                    continue
+                v = abs(q)
+                if v not in seen and self.level[v] > 0:
+                    seen.add(v)
+                    self.bump(v)
+                    if self.level[v] == current:
+                        pending += 1
+                    else:
+                        learnt.append(q)
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            lit = self.trail[index]
+            index -= 1
+            clause = self.reason[abs(lit)]
+            pending -= 1
+            if pending == 0:
+                break
+        learnt[0] = -lit
+        back = 0
+        if len(learnt) > 1:
+            # Watch the highest-level literal second, so it is the last to go
+            i = max(range(1, len(learnt)), key=lambda k: self.level[abs(learnt[k])])
+            learnt[1], learnt[i] = learnt[i], learnt[1]
+            back = self.level[abs(learnt[1])]
+        self.var_inc /= 0.95
+        return learnt, back
+
+    def backjump(self, level):
+        if len(self.trail_lim) <= level:
+            return
+        start = self.trail_lim[level]
+        for lit in self.trail[start:]:
+            v = abs(lit)
+            self.phase[v] = self.value[v]
+            self.value[v] = 0
+            self.reason[v] = None
+            heapq.heappush(self.order, (-self.activity[v], v))
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.qhead = start
+
+    def decide(self):
+        while self.order:
+            _, v = heapq.heappop(self.order)
+            if self.value[v] == 0:
+                return v if self.phase[v] > 0 else -v
+        return None
+
+    def solve(self):
+        """{variable: bool} satisfying every clause, or None if unsatisfiable."""
+        if not self.ok:
+            return None
+        restart_at, restart_gap = 100, 100
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if not self.trail_lim:
+                    return None
+                learnt, back = self.analyze(conflict)
+                self.backjump(back)
+                if len(learnt) == 1:
+                    self.enqueue(learnt[0], None)
+                else:
+                    self.clauses.append(learnt)
+                    self.watch(learnt)
+                    self.enqueue(learnt[0], learnt)
+                if self.conflicts >= restart_at:
+                    restart_gap = int(restart_gap * 1.5)
+                    restart_at = self.conflicts + restart_gap
+                    self.backjump(0)
+                continue
+            lit = self.decide()
+            if lit is None:
+                return {v: self.value[v] > 0 for v in range(1, self.num_vars + 1)}
+            self.trail_lim.append(len(self.trail))
+            self.enqueue(lit, None)
+
+def satisfiable(formulas):
+    """A {symbol: bool} model making every formula true, or None."""
+    cnf = CNF()
+    for formula in formulas:
+        cnf.add(formula)
+    model = Solver(cnf.num_vars, cnf.clauses).solve()
+    if model is None:
+        return None
+    return {name: model[v] for name, v in cnf.var_of.items()}
+
+def sat_entails(KB, alpha, symbols=None):
+    """KB |= alpha iff KB & ~alpha has no model."""
+    if symbols is not None:
+        missing = [s for f in (KB, alpha) for s in symbols_of(f) if s not in symbols]
+        if missing:
+            raise ValueError(f"Symbols {sorted(set(missing))} are not in {list(symbols)}")
+    return satisfiable([KB, ("not", as_ast(alpha))]) is None
@@ -0,0 +1,145 @@
+# Streaming truth tables for KB and alpha.
+#
+# Rows come out lazily, one bit-parallel chunk (bitparallel.chunks) at a time,
+# so a table over any number of symbols can be filtered, paged and written out
+# without holding it in memory or evaluating a formula per row. A row is
+# (model index, values, KB, alpha) with models numbered in
+# itertools.product([False, True], repeat=n) order.
+#
+#   python truth_table.py "(A | C) & (B | ~C)" "A | B" --where counterexamples
+#   python truth_table.py KB alpha --symbols A,B,C --start 4 --stop 8 --csv page.csv
+
+import argparse
+import csv
+import struct
+import sys
+from array import array
+
+from bitparallel import CHUNK_BITS, chunks
+from logic import symbols_of
+
+MAGIC = b"TTROWS1\0"
+HEADER = struct.Struct("<8sQ")   # magic, symbol count; then one uint64 per row
+
+# Which models to keep, as a bitset of the chunk's KB and alpha columns
+FILTERS = {
+    "all": lambda kb, a, mask: mask,
+    "models": lambda kb, a, mask: kb,                    # KB true
+    "entailed": lambda kb, a, mask: kb & a,              # KB and alpha true
+    "counterexamples": lambda kb, a, mask: kb & ~a,      # KB true, alpha false
+}
+
+def _selected(KB, alpha, symbols, where, start, stop, chunk_bits):
+    # Yield (first model index, chunk bits of selected rows, kb, alpha) per chunk
+    keep = FILTERS[where]
+    total = 1 << len(symbols)
+    stop = total if stop is None else min(stop, total)
+    for base, size, (kb, a) in chunks((KB, alpha), symbols, chunk_bits, start, stop):
+        mask = (1 << size) - 1
+        bits = keep(kb, a, mask) & mask
+        if base < start:
+            bits &= ~((1 << (start - base)) - 1)
+        if base + size > stop:
+            bits &= (1 << (stop - base)) - 1
+        yield base, bits, kb, a
+
+def _offsets(bits):
+    # Set bit positions, lowest first; a string scan is linear where
+    # peeling bits off a big int one at a time is quadratic
+    text = bin(bits)[:1:-1]
+    k = text.find("1")
+    while k >= 0:
+        yield k
+        k = text.find("1", k + 1)
+
+def rows(KB, alpha, symbols, where="all", start=0, stop=None, chunk_bits=CHUNK_BITS):
+    """Yield (index, values, KB value, alpha value) for models start..stop-1.
+
+    where picks the rows: "all", "models" (KB true), "entailed" (KB and alpha
+    true) or "counterexamples" (KB true, alpha false).
+    """
+    n = len(symbols)
+    for base, bits, kb, a in _selected(KB, alpha, symbols, where, start, stop, chunk_bits):
+        for k in _offsets(bits):
+            index = base + k
+            values = tuple(bool(index >> (n - 1 - i) & 1) for i in range(n))
+            yield index, values, bool(kb >> k & 1), bool(a >> k & 1)
+
+def count_rows(KB, alpha, symbols, where="all", start=0, stop=None, chunk_bits=CHUNK_BITS):
+    """Number of rows rows() would yield, without producing them."""
+    return sum(bin(bits).count("1") for _, bits, _, _ in
+               _selected(KB, alpha, symbols, where, start, stop, chunk_bits))
+
+def write_csv(out, KB, alpha, symbols, **options):
+    """Write the header and rows as 0/1 CSV to a path or text file; returns the row count."""
+    if isinstance(out, str):
+        with open(out, "w", newline="") as f:
+            return write_csv(f, KB, alpha, symbols, **options)
+    writer = csv.writer(out)
+    writer.writerow(list(symbols) + [KB, alpha])
+    count = 0
+    for _, values, kb, a in rows(KB, alpha, symbols, **options):
+        writer.writerow([int(v) for v in values] + [int(kb), int(a)])
+        count += 1
+    return count
+
+def write_binary(out, KB, alpha, symbols, where="all", start=0, stop=None,
+                 chunk_bits=CHUNK_BITS):
+    """Write rows as uint64 records (index << 2 | KB << 1 | alpha) to a path
+    or binary file; returns the row count. Needs at most 62 symbols."""
+    if len(symbols) > 62:
+        raise ValueError("Binary rows hold at most 62 symbols")
+    if isinstance(out, str):
+        with open(out, "wb") as f:
+            return write_binary(f, KB, alpha, symbols, where, start, stop, chunk_bits)
+    out.write(HEADER.pack(MAGIC, len(symbols)))
+    count = 0
+    for base, bits, kb, a in _selected(KB, alpha, symbols, where, start, stop, chunk_bits):
+        records = array("Q", ((base + k) << 2 | (kb >> k & 1) << 1 | (a >> k & 1)
+                              for k in _offsets(bits)))
+        records.tofile(out)
+        count += len(records)
+    return count
+
+def read_binary(path):
+    """Yield (index, values, KB value, alpha value) from a write_binary file."""
+    with open(path, "rb") as f:
+        magic, n = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a truth table file")
+        while True:
+            records = array("Q")
+            records.frombytes(f.read(8 << 16))
+            if not records:
+                return
+            for r in records:
+                index = r >> 2
+                values = tuple(bool(index >> (n - 1 - i) & 1) for i in range(n))
+                yield index, values, bool(r & 2), bool(r & 1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream the truth table of KB and alpha.")
+    parser.add_argument("KB")
+    parser.add_argument("alpha")
+    parser.add_argument("--symbols", help="comma-separated, default in order of appearance")
+    parser.add_argument("--where", choices=FILTERS, default="all")
+    parser.add_argument("--start", type=int, default=0, help="first model index")
+    parser.add_argument("--stop", type=int, default=None, help="model index to stop before")
+    parser.add_argument("--csv", metavar="PATH", help="write CSV here ('-' for stdout)")
+    parser.add_argument("--binary", metavar="PATH", help="write packed rows here")
+    parser.add_argument("--count", action="store_true", help="only count the rows")
+    args = parser.parse_args()
+    if args.symbols:
+        symbols = args.symbols.split(",")
+    else:
+        symbols = list(dict.fromkeys(symbols_of(args.KB) + symbols_of(args.alpha)))
+    options = dict(where=args.where, start=args.start, stop=args.stop)
+
+    if args.count:
+        print(count_rows(args.KB, args.alpha, symbols, **options))
+    elif args.binary:
+        print(write_binary(args.binary, args.KB, args.alpha, symbols, **options), "rows")
+    elif args.csv and args.csv != "-":
+        print(write_csv(args.csv, args.KB, args.alpha, symbols, **options), "rows")
+    else:
+        write_csv(sys.stdout, args.KB, args.alpha, symbols, **options)